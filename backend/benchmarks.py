@@ -0,0 +1,477 @@
+import os
+import time
+import tracemalloc
+import warnings
+import json
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from nc_converter import NetCDFConverter
+
+def measure(func, *args, **kwargs):
+    """Run ``func`` once and return its result, wall time and peak traced memory"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, elapsed, peak
+
+def make_argo_dataset(n_prof=200, n_levels=500, n_param=3, seed=0):
+    """Build an in-memory dataset shaped like an ARGO multi-profile file"""
+    rng = np.random.default_rng(seed)
+    levels = ('N_PROF', 'N_LEVELS')
+
+    data_vars = {
+        'PLATFORM_NUMBER': ('N_PROF', np.array([b'2901623 '] * n_prof, dtype='S8')),
+        'DATA_MODE': ('N_PROF', rng.choice(np.array([b'R', b'A', b'D']), n_prof)),
+        'CYCLE_NUMBER': ('N_PROF', np.arange(n_prof, dtype=np.float64)),
+        'LATITUDE': ('N_PROF', rng.uniform(-20, 0, n_prof)),
+        'LONGITUDE': ('N_PROF', rng.uniform(60, 80, n_prof)),
+        'STATION_PARAMETERS': (('N_PROF', 'N_PARAM'),
+                               np.tile(np.array([b'PRES', b'TEMP', b'PSAL'][:n_param], dtype='S16'),
+                                       (n_prof, 1)))
+    }
+    for name in ('PRES', 'TEMP', 'PSAL'):
+        for suffix in ('', '_ADJUSTED'):
+            data_vars[name + suffix] = (levels, rng.random((n_prof, n_levels)).astype(np.float32) * 30)
+            data_vars[name + suffix + '_QC'] = (levels, rng.choice(np.array([b'1', b'2', b'4']),
+                                                                   (n_prof, n_levels)))
+        data_vars[name + '_ADJUSTED_ERROR'] = (levels, np.full((n_prof, n_levels), np.nan, np.float32))
+
+    return xr.Dataset(data_vars)
+
+def legacy_clean_dataframe(df):
+    """The cleaning stage as it was before the single-pass rework"""
+    df = df.dropna(axis=1, how='all')
+
+    with warnings.catch_warnings():
+        # The old code assigned into the dropna() result
+        warnings.simplefilter('ignore')
+
+        for col in df.select_dtypes(include=['object']).columns:
+            try:
+                df[col] = pd.to_numeric(df[col])
+            except (ValueError, TypeError):
+                pass
+
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        df[numeric_cols] = df[numeric_cols].round(6)
+
+    return df
+
+def bench_cleaning(n_prof=200, n_levels=500, n_param=3):
+    """Compare the old and new cleaning stages on a synthetic ARGO dataset
+
+    ``frame`` times the cleaning of an already exploded DataFrame, the way
+    ``_clean_dataframe`` is called directly. ``conversion`` times the full
+    dataset-to-frame step of ``convert_single_file``, where the new code
+    cleans the variables before they are exploded.
+    """
+    converter = NetCDFConverter.__new__(NetCDFConverter)
+    ds = make_argo_dataset(n_prof, n_levels, n_param)
+
+    def legacy_conversion():
+        return legacy_clean_dataframe(ds.to_dataframe().reset_index())
+
+    def new_conversion():
+        prepared, drop_columns = converter._prepare_dataset(ds)
+        df = prepared.to_dataframe().reset_index()
+        df.drop(columns=drop_columns, inplace=True)
+        return df
+
+    frame = ds.to_dataframe().reset_index()
+    report = {'rows': len(frame), 'columns': len(frame.columns)}
+
+    # The frame copies are made before measuring starts
+    cases = {
+        'frame': ((legacy_clean_dataframe, frame.copy()),
+                  (converter._clean_dataframe, frame.copy())),
+        'conversion': ((legacy_conversion,), (new_conversion,))
+    }
+    del frame
+
+    for label, (legacy, new) in cases.items():
+        _, legacy_time, legacy_peak = measure(*legacy)
+        _, new_time, new_peak = measure(*new)
+        report[label] = {
+            'legacy_seconds': round(legacy_time, 3),
+            'new_seconds': round(new_time, 3),
+            'legacy_peak_mb': round(legacy_peak / (1024 * 1024), 1),
+            'new_peak_mb': round(new_peak / (1024 * 1024), 1)
+        }
+
+    return report
+
+def make_training_documents(n_items, seed=0):
+    """Synthetic Q&A documents shaped like chatbot-training items"""
+    rng = np.random.default_rng(seed)
+    parameters = ['temperature', 'salinity', 'pressure', 'dissolved oxygen']
+    regions = ['Arabian Sea', 'Bay of Bengal', 'Southern Indian Ocean', 'Equatorial Indian Ocean']
+
+    documents = []
+    for i in range(n_items):
+        parameter = parameters[rng.integers(len(parameters))]
+        region = regions[rng.integers(len(regions))]
+        depth = int(rng.integers(0, 2000))
+        documents.append({
+            'id': f'training_{i}',
+            'text': f"Q: What is the {parameter} at {depth}m for float {2901600 + i % 500} "
+                    f"in the {region}? A: Profile {i % 200} reports {parameter} "
+                    f"of {rng.uniform(0, 40):.2f} at {depth}m.",
+            'metadata': {'type': 'training', 'category': parameter}
+        })
+    return documents
+
+def bench_embedding(n_items=2000, batch_sizes=(16, 64, 256), model_name='all-MiniLM-L6-v2'):
+    """Ingestion throughput of one document at a time against batched adds
+
+    Covers encoding and FAISS insertion, the part of chatbot-training that
+    runs per item. Needs sentence-transformers and faiss.
+    """
+    from vector_db import ArgoVectorDB
+
+    vdb = ArgoVectorDB(model_name)
+    documents = make_training_documents(n_items)
+    vdb.model.encode([documents[0]['text']])  # load weights before timing
+
+    def run(label, ingest):
+        vdb.index.reset()
+        vdb.documents.clear()
+        start = time.perf_counter()
+        ingest()
+        elapsed = time.perf_counter() - start
+        report[label] = {
+            'seconds': round(elapsed, 3),
+            'items_per_second': round(n_items / elapsed, 1),
+            'indexed': vdb.index.ntotal
+        }
+
+    report = {'items': n_items, 'model': model_name}
+    run('single', lambda: [vdb.add_document(doc['id'], doc['text'], doc['metadata'])
+                           for doc in documents])
+    for batch_size in batch_sizes:
+        run(f'batch_{batch_size}', lambda: vdb.add_documents(documents, batch_size=batch_size))
+
+    return report
+
+def make_embeddings(n_vectors, dimension=384, n_clusters=100, seed=0):
+    """Unit vectors grouped around topics, like sentence embeddings"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((n_clusters, dimension)).astype(np.float32)
+    vectors = centres[rng.integers(n_clusters, size=n_vectors)]
+    vectors += 0.5 * rng.standard_normal((n_vectors, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+# Index types and the search parameter values swept for each
+ANN_SWEEPS = {
+    'ivf_flat': ('nprobe', (1, 4, 16, 64)),
+    'ivf_pq': ('nprobe', (1, 4, 16, 64)),
+    'hnsw': ('ef_search', (16, 64, 256))
+}
+
+def bench_ann(n_vectors=50000, n_queries=500, k=10, dimension=384, nlist=1024, pq_m=16):
+    """Recall and latency of the approximate index types against the flat baseline
+
+    Latency is per single-query search, the way /api/chat searches.
+    Recall is the share of the exact top ``k`` that each index returns.
+    """
+    from vector_db import build_index, set_search_params
+
+    data = make_embeddings(n_vectors + n_queries, dimension)
+    vectors, queries = data[:n_vectors], data[n_vectors:]
+
+    start = time.perf_counter()
+    flat = build_index(vectors, dimension, 'flat')
+    build_seconds = time.perf_counter() - start
+    truth, latency = search_each(flat, queries, k)
+
+    report = {'vectors': n_vectors, 'queries': n_queries, 'k': k,
+              'flat': {'build_seconds': round(build_seconds, 2),
+                       'latency_ms': round(latency * 1000, 3), 'recall': 1.0}}
+
+    for index_type, (param, values) in ANN_SWEEPS.items():
+        start = time.perf_counter()
+        index = build_index(vectors, dimension, index_type, nlist=nlist, pq_m=pq_m)
+        report[index_type] = {'build_seconds': round(time.perf_counter() - start, 2), param: {}}
+
+        for value in values:
+            set_search_params(index, **{param: value})
+            labels, latency = search_each(index, queries, k)
+            report[index_type][param][value] = {
+                'latency_ms': round(latency * 1000, 3),
+                'recall': recall(labels, truth)
+            }
+
+    return report
+
+def search_each(index, queries, k):
+    """Search one query at a time; returns the labels and mean latency in seconds"""
+    labels = np.empty((len(queries), k), dtype=np.int64)
+    start = time.perf_counter()
+    for i in range(len(queries)):
+        _, labels[i] = index.search(queries[i:i + 1], k)
+    return labels, (time.perf_counter() - start) / len(queries)
+
+def recall(labels, truth):
+    """Share of the exact neighbours in ``truth`` found in ``labels``"""
+    hits = sum(len(np.intersect1d(found, exact)) for found, exact in zip(labels, truth))
+    return round(hits / truth.size, 3)
+
+def bench_quantization(n_vectors=50000, n_queries=500, k=10, dimension=384,
+                       storage_types=('flat', 'fp16', 'sq8', 'pq', 'ivf_sq8', 'ivf_pq'),
+                       pq_m=48, nprobe=16):
+    """Memory footprint and recall of the vector storage modes
+
+    Recall@``k`` is measured against exact float32 search. PQ uses
+    ``pq_m`` bytes per vector (8-bit codes), IVF types scan ``nprobe`` lists.
+    """
+    from vector_db import build_index, index_memory_bytes, set_search_params
+
+    data = make_embeddings(n_vectors + n_queries, dimension)
+    vectors, queries = data[:n_vectors], data[n_vectors:]
+    truth = None
+    report = {'vectors': n_vectors, 'queries': n_queries, 'k': k, 'dimension': dimension}
+
+    for storage_type in ('flat',) + tuple(t for t in storage_types if t != 'flat'):
+        start = time.perf_counter()
+        index = build_index(vectors, dimension, storage_type, pq_m=pq_m)
+        build_seconds = time.perf_counter() - start
+        set_search_params(index, nprobe=nprobe)
+
+        labels, latency = search_each(index, queries, k)
+        if truth is None:
+            truth = labels
+        memory = index_memory_bytes(index)
+
+        report[storage_type] = {
+            'memory_mb': round(memory / (1024 * 1024), 2),
+            'bytes_per_vector': round(memory / n_vectors, 1),
+            'compression': round(report['flat']['memory_mb'] * 1024 * 1024 / memory, 1)
+                           if storage_type != 'flat' else 1.0,
+            'recall': recall(labels, truth),
+            'latency_ms': round(latency * 1000, 3),
+            'build_seconds': round(build_seconds, 2)
+        }
+
+    return report
+
+def check_updates(n_vectors=20000, n_changed=500, dimension=384,
+                  index_types=('flat', 'ivf_flat', 'ivf_sq8', 'ivf_pq', 'hnsw', 'fp16', 'sq8', 'pq'),
+                  nlist=256, pq_m=48):
+    """Searches still return the right ids after deletes and re-upserts
+
+    For each index type, ``n_changed`` vectors are deleted and as many
+    are replaced with new vectors under the same ids, the way
+    upsert_vectors and delete_from_vector_db change the index. The
+    self-hit rate (a stored vector finding its own id first) of the
+    untouched vectors must not drop, deleted ids must never be returned
+    and replaced ids must find their new vectors. Each type is also
+    checked after a round trip through a memory-mapped snapshot, written
+    to the way the app writes to VECTOR_INDEX_MMAP indexes. Raises
+    AssertionError on the first type that fails.
+    """
+    import shutil
+    import tempfile
+    from vector_db import (build_index, save_index, load_index, unmap_index, remove_ids, index_ids,
+                           index_vectors, search_subset, set_search_params)
+
+    rng = np.random.default_rng(0)
+    data = make_embeddings(n_vectors + n_changed, dimension)
+    vectors, replacements = data[:n_vectors], data[n_vectors:]
+    ids = rng.choice(2 ** 62, size=n_vectors, replace=False).astype(np.int64)
+    deleted, replaced = ids[:n_changed], ids[n_changed:2 * n_changed]
+    probe = np.arange(2 * n_changed, min(n_vectors, 3 * n_changed))
+    report = {'vectors': n_vectors, 'changed': n_changed}
+
+    snapshot_dir = tempfile.mkdtemp()
+    cases = [(index_type, mapped) for index_type in index_types for mapped in (False, True)]
+    for index_type, mapped in cases:
+        name = f"{index_type}_mmap" if mapped else index_type
+        index = build_index(vectors, dimension, index_type, nlist=nlist, pq_m=pq_m, ids=ids)
+        if mapped:
+            path = os.path.join(snapshot_dir, f"{index_type}.faiss")
+            save_index(index, path)
+            index = load_index(path, dimension, mmap=True)
+        set_search_params(index, nprobe=nlist, ef_search=256)
+        _, labels = index.search(vectors[probe], 1)
+        before = float(np.mean(labels[:, 0] == ids[probe]))
+
+        if mapped:
+            index = unmap_index(index)
+        index = remove_ids(index, np.concatenate([deleted, replaced]))
+        index.add_with_ids(replacements, replaced)
+
+        _, labels = index.search(vectors[probe], 1)
+        after = float(np.mean(labels[:, 0] == ids[probe]))
+        _, labels = index.search(replacements, 1)
+        replaced_hits = float(np.mean(labels[:, 0] == replaced))
+        _, subset_labels = search_subset(index, vectors[probe[:10]], 5, ids[probe])
+        stored = index_ids(index)
+
+        assert after >= before - 0.01, f"{name}: self-hit rate fell from {before} to {after}"
+        assert not np.isin(stored, deleted).any(), f"{name}: deleted ids are still stored"
+        assert not np.isin(labels, deleted).any(), f"{name}: search returned deleted ids"
+        assert np.isin(subset_labels, ids[probe]).all(), f"{name}: filtered search left its subset"
+        assert len(index_vectors(index)) == index.ntotal == n_vectors - n_changed
+        report[name] = {'self_hits_before': round(before, 3), 'self_hits_after': round(after, 3),
+                        'replaced_hits': round(replaced_hits, 3)}
+
+    shutil.rmtree(snapshot_dir)
+    return report
+
+def check_training(n_items=200):
+    """Batched chatbot training stores, counts and replaces items correctly
+
+    Sends ``n_items`` questions to POST /api/admin/chatbot-training in one
+    request through the Flask test client, with every tenth question
+    repeated and a few invalid items. The response counts, vector_metadata
+    and the FAISS index must agree; sending half of the questions again
+    must replace their entries under the same vector ids; and every id
+    must be removable with DELETE /api/admin/vectors/<doc_id>. Runs
+    against the MongoDB and database the app is configured with and
+    removes what it added. Raises AssertionError on the first mismatch.
+    """
+    import uuid
+    from datetime import datetime, timedelta
+    from urllib.parse import quote
+    import jwt
+    import app as floatchat
+
+    run = uuid.uuid4().hex[:8]
+    payload = [{'question': f"What is check {run} item {i}?", 'answer': f"Answer {i}"}
+               for i in range(n_items)]
+    repeated = list(range(0, n_items, 10))
+    payload += [dict(payload[i], answer=f"Repeated answer {i}") for i in repeated]
+    invalid = [{'question': f"Unanswered check {run}?"}, {'answer': 'No question'}, {}]
+    payload += invalid
+
+    client = floatchat.app.test_client()
+    client.get('/api/health')  # runs the app's first-request setup
+    with floatchat.app.app_context():
+        admin = floatchat.User.query.filter_by(role='admin').first()
+        token = jwt.encode({'user_id': admin.id, 'username': admin.username, 'role': admin.role,
+                            'exp': datetime.utcnow() + timedelta(hours=1)},
+                           floatchat.app.config['SECRET_KEY'], algorithm='HS256')
+    headers = {'Authorization': f"Bearer {token}"}
+
+    def stored(doc_ids):
+        return {doc['doc_id']: doc for doc in floatchat.mongo_db.vector_metadata.find(
+            {'doc_id': {'$in': doc_ids}}, {'_id': 0, 'doc_id': 1, 'index': 1, 'text': 1})}
+
+    def train(items):
+        response = client.post('/api/admin/chatbot-training', headers=headers, json={'training_data': items})
+        assert response.status_code == 200, f"chatbot-training returned {response.status_code}"
+        return response.get_json()
+
+    try:
+        ntotal = floatchat.vector_index.ntotal
+        start = time.perf_counter()
+        first = train(payload)
+        elapsed = time.perf_counter() - start
+        doc_ids = first['doc_ids']
+        docs = stored(doc_ids)
+
+        assert first['added'] == len(doc_ids) == len(set(doc_ids)) == n_items, \
+            f"added {first['added']} with {len(doc_ids)} doc_ids for {n_items} questions"
+        assert first['skipped'] == len(repeated) + len(invalid), \
+            f"skipped {first['skipped']}, expected {len(repeated) + len(invalid)}"
+        assert len(docs) == n_items, f"{len(docs)} of {n_items} items stored"
+        assert all(docs[doc_ids[i]]['text'].endswith(f"Repeated answer {i}") for i in repeated), \
+            "a repeated question did not keep its last answer"
+        assert floatchat.vector_index.ntotal == ntotal + n_items
+
+        half = n_items // 2
+        second = train([dict(item, answer=f"New answer {i}") for i, item in enumerate(payload[:half])])
+        redone = stored(doc_ids)
+
+        assert second['doc_ids'] == doc_ids[:half] and second['added'] == half and second['skipped'] == 0
+        assert floatchat.vector_index.ntotal == ntotal + n_items, "re-sent questions added new vectors"
+        assert all(redone[doc_id]['index'] == docs[doc_id]['index'] for doc_id in doc_ids), \
+            "a re-sent question changed its vector id"
+        assert all(redone[doc_ids[i]]['text'].endswith(f"New answer {i}") for i in range(half))
+
+        for doc_id in doc_ids:
+            response = client.delete(f"/api/admin/vectors/{quote(doc_id, safe='')}", headers=headers)
+            assert response.status_code == 200, f"deleting {doc_id} returned {response.status_code}"
+        assert not stored(doc_ids), "deleted items are still stored"
+        assert floatchat.vector_index.ntotal == ntotal
+    finally:
+        leftover = [doc['doc_id'] for doc in floatchat.mongo_db.vector_metadata.find(
+            {'doc_id': {'$regex': f"check {run}"}}, {'_id': 0, 'doc_id': 1})]
+        if leftover:
+            floatchat.delete_from_vector_db(leftover)
+
+    return {
+        'items': len(payload),
+        'added': first['added'],
+        'skipped': first['skipped'],
+        'seconds': round(elapsed, 3),
+        'items_per_second': round(len(payload) / elapsed, 1)
+    }
+
+def main():
+    """Command line interface for the FloatChat benchmarks"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='FloatChat performance benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    cleaning = subparsers.add_parser('cleaning', help='NetCDF DataFrame cleaning stage')
+    cleaning.add_argument('--profiles', type=int, default=200)
+    cleaning.add_argument('--levels', type=int, default=500)
+    cleaning.add_argument('--params', type=int, default=3)
+
+    embedding = subparsers.add_parser('embedding', help='Vector database ingestion throughput')
+    embedding.add_argument('--items', type=int, default=2000)
+    embedding.add_argument('--batch-sizes', default='16,64,256',
+                           help='Comma separated batch sizes to compare')
+    embedding.add_argument('--model', default='all-MiniLM-L6-v2')
+
+    ann = subparsers.add_parser('ann', help='Approximate vector index recall against latency')
+    ann.add_argument('--vectors', type=int, default=50000)
+    ann.add_argument('--queries', type=int, default=500)
+    ann.add_argument('--k', type=int, default=10)
+    ann.add_argument('--nlist', type=int, default=1024)
+    ann.add_argument('--pq-m', type=int, default=16)
+
+    quantization = subparsers.add_parser('quantization', help='Vector storage memory against recall')
+    quantization.add_argument('--vectors', type=int, default=50000)
+    quantization.add_argument('--queries', type=int, default=500)
+    quantization.add_argument('--k', type=int, default=10)
+    quantization.add_argument('--pq-m', type=int, default=48)
+    quantization.add_argument('--nprobe', type=int, default=16)
+
+    updates = subparsers.add_parser('updates', help='Search correctness after vector deletes and re-upserts')
+    updates.add_argument('--vectors', type=int, default=20000)
+    updates.add_argument('--changed', type=int, default=500)
+
+    training = subparsers.add_parser('training', help='Batched chatbot training ingest through the API')
+    training.add_argument('--items', type=int, default=200)
+
+    args = parser.parse_args()
+
+    if args.benchmark == 'cleaning':
+        report = bench_cleaning(args.profiles, args.levels, args.params)
+    elif args.benchmark == 'embedding':
+        batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+        report = bench_embedding(args.items, batch_sizes, args.model)
+    elif args.benchmark == 'ann':
+        report = bench_ann(args.vectors, args.queries, args.k, nlist=args.nlist, pq_m=args.pq_m)
+    elif args.benchmark == 'quantization':
+        report = bench_quantization(args.vectors, args.queries, args.k, pq_m=args.pq_m, nprobe=args.nprobe)
+    elif args.benchmark == 'updates':
+        report = check_updates(args.vectors, args.changed)
+    elif args.benchmark == 'training':
+        report = check_training(args.items)
+
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
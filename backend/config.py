@@ -10,7 +10,34 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     MONGODB_URI = os.environ.get('MONGODB_URI') or 'mongodb://localhost:27017/floatchat'
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'uploads'
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    # Per request; larger files go through the chunked upload endpoints
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH') or 16 * 1024 * 1024)
+    MAX_UPLOAD_SIZE = int(os.environ.get('MAX_UPLOAD_SIZE') or 20 * 1024 * 1024 * 1024)
+    NC_LAZY_LOADING = os.environ.get('NC_LAZY_LOADING', 'false').lower() == 'true'
+    NC_CHUNK_SIZE = int(os.environ.get('NC_CHUNK_SIZE') or 100)
+    CONVERSION_WORKERS = int(os.environ.get('CONVERSION_WORKERS') or 2)
+    EMBEDDING_BATCH_SIZE = int(os.environ.get('EMBEDDING_BATCH_SIZE') or 64)
+    VECTOR_METADATA_CACHE_SIZE = int(os.environ.get('VECTOR_METADATA_CACHE_SIZE') or 10000)
+    EMBEDDING_SERVER_SOCKET = os.environ.get('EMBEDDING_SERVER_SOCKET') or None
+    QUERY_CACHE_SIZE = int(os.environ.get('QUERY_CACHE_SIZE') or 1024)
+    QUERY_CACHE_TTL = int(os.environ.get('QUERY_CACHE_TTL') or 600)
+    VECTOR_INDEX_PATH = os.environ.get('VECTOR_INDEX_PATH') or os.path.join('vector_index', 'floatchat.faiss')
+    VECTOR_INDEX_MMAP = os.environ.get('VECTOR_INDEX_MMAP', 'false').lower() == 'true'
+    VECTOR_SNAPSHOT_INTERVAL = int(os.environ.get('VECTOR_SNAPSHOT_INTERVAL') or 300)
+    VECTOR_INDEX_TYPE = os.environ.get('VECTOR_INDEX_TYPE') or 'flat'
+    VECTOR_TRAIN_SIZE = int(os.environ.get('VECTOR_TRAIN_SIZE') or 20000)
+    VECTOR_NLIST = int(os.environ.get('VECTOR_NLIST') or 1024)
+    VECTOR_PQ_M = int(os.environ.get('VECTOR_PQ_M') or 16)
+    VECTOR_NPROBE = int(os.environ.get('VECTOR_NPROBE') or 16)
+    VECTOR_EF_SEARCH = int(os.environ.get('VECTOR_EF_SEARCH') or 64)
+    HYBRID_SEARCH = os.environ.get('HYBRID_SEARCH', 'true').lower() == 'true'
+    HYBRID_CANDIDATES = int(os.environ.get('HYBRID_CANDIDATES') or 50)
+    FLOATS_PAGE_SIZE = int(os.environ.get('FLOATS_PAGE_SIZE') or 1000)
+    FLOATS_MAX_PAGE_SIZE = int(os.environ.get('FLOATS_MAX_PAGE_SIZE') or 10000)
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or 256)
+    RESPONSE_CACHE_CHECK_INTERVAL = float(os.environ.get('RESPONSE_CACHE_CHECK_INTERVAL') or 1.0)
+    SPATIAL_CELL_SIZE = float(os.environ.get('SPATIAL_CELL_SIZE') or 1.0)
+    PROFILE_INGEST_BATCH_SIZE = int(os.environ.get('PROFILE_INGEST_BATCH_SIZE') or 1000)
     JWT_EXPIRATION_HOURS = 24
 
 class DevelopmentConfig(Config):
@@ -0,0 +1,240 @@
+import os
+import socket
+import threading
+import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from nc_converter import NetCDFConverter
+
+logger = logging.getLogger(__name__)
+
+def run_conversion(nc_file_path, output_path, converter_options):
+    """Convert one file in a worker process; must stay importable at module level"""
+    converter = NetCDFConverter(**converter_options)
+    return converter.convert_single_file(nc_file_path, output_path)
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+class ConversionJobQueue:
+    """Background NetCDF conversions tracked as ``conversion_logs`` documents
+
+    Jobs run in a local process pool, so no external broker is needed and
+    the request thread returns as soon as the job is recorded. Each job is
+    a conversion log with status ``processing`` that is switched to
+    ``success`` or ``failed`` when the conversion finishes. Status lives in
+    MongoDB, so any web worker can answer for a job started by another.
+
+    Ingest jobs (``kind`` ``ingest``) load a conversion's output into the
+    database. They need the web worker's database connections, so they
+    run one at a time on a thread of the worker instead.
+
+    Each job records the web worker that runs it (``host:pid``). If that
+    process dies, nobody records the outcome; ``fail_orphaned`` marks such
+    jobs as failed.
+    """
+
+    def __init__(self, collection, max_workers=2):
+        self.collection = collection
+        self.max_workers = max_workers
+        self._executor = None
+        self._ingest_executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created on first use so that each (forked) web worker gets its own pool
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _get_ingest_executor(self):
+        with self._lock:
+            if self._ingest_executor is None:
+                self._ingest_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='profile-ingest')
+            return self._ingest_executor
+
+    def submit_ingest(self, user_id, source_job, ingest):
+        """Record an ingest of ``source_job``'s output and start it; returns the job id
+
+        ``ingest`` is called without arguments on the ingest thread and
+        returns a JSON-friendly summary, stored as the job's ``result``.
+        """
+        now = datetime.utcnow()
+        job = {
+            'kind': 'ingest',
+            'user_id': user_id,
+            'source_job': str(source_job['_id']),
+            'original_file': source_job.get('original_file'),
+            'csv_file': None,
+            'output_file': source_job.get('output_file'),
+            'output_format': source_job.get('output_format'),
+            'status': 'processing',
+            'worker': self.worker_name(),
+            'submitted_at': now,
+            'timestamp': now
+        }
+        job_id = self.collection.insert_one(job).inserted_id
+        self._get_ingest_executor().submit(self._run_ingest, job_id, ingest)
+        return str(job_id)
+
+    def _run_ingest(self, job_id, ingest):
+        try:
+            update = {'status': 'success', 'result': ingest()}
+        except Exception as e:
+            logger.error(f"Ingest job {job_id} failed: {str(e)}")
+            update = {'status': 'failed', 'error': str(e)}
+
+        now = datetime.utcnow()
+        update['completed_at'] = now
+        update['timestamp'] = now
+        try:
+            self.collection.update_one({'_id': job_id}, {'$set': update})
+        except Exception as e:
+            logger.error(f"Could not record outcome of ingest job {job_id}: {str(e)}")
+
+    def submit(self, user_id, nc_file_path, original_file, output_path,
+               converter_options, cleanup=True):
+        """Record a conversion job and start it; returns the job id
+
+        ``cleanup`` removes the input file once the job is done.
+        """
+        now = datetime.utcnow()
+        job = {
+            'user_id': user_id,
+            'original_file': original_file,
+            'csv_file': None,
+            'output_file': None,
+            'output_format': converter_options.get('output_format', 'csv'),
+            'status': 'processing',
+            'worker': self.worker_name(),
+            'submitted_at': now,
+            'timestamp': now
+        }
+        job_id = self.collection.insert_one(job).inserted_id
+
+        try:
+            future = self._get_executor().submit(run_conversion, nc_file_path,
+                                                 output_path, converter_options)
+        except Exception as e:
+            # Pool is broken or shutting down; fail the job rather than the request
+            self._finish(job_id, nc_file_path, cleanup, None, error=e)
+            return str(job_id)
+
+        future.add_done_callback(partial(self._finish, job_id, nc_file_path, cleanup))
+        return str(job_id)
+
+    def _finish(self, job_id, nc_file_path, cleanup, future, error=None):
+        """Store the outcome of a job; runs in the executor's callback thread"""
+        if error is None:
+            try:
+                result = future.result()
+                error = None if result['success'] else result['error']
+            except Exception as e:
+                error = e
+
+        now = datetime.utcnow()
+        if error is None:
+            output_file = os.path.basename(result['output_file'])
+            update = {
+                'status': 'success',
+                'csv_file': output_file if result['output_format'] == 'csv' else None,
+                'output_file': output_file,
+                'rows': result['rows'],
+                'columns': result['columns'],
+                'file_size_mb': result['file_size_mb']
+            }
+        else:
+            logger.error(f"Conversion job {job_id} failed: {str(error)}")
+            update = {'status': 'failed', 'error': str(error)}
+
+        update['completed_at'] = now
+        update['timestamp'] = now
+
+        try:
+            self.collection.update_one({'_id': job_id}, {'$set': update})
+        except Exception as e:
+            logger.error(f"Could not record outcome of conversion job {job_id}: {str(e)}")
+        finally:
+            if cleanup and os.path.exists(nc_file_path):
+                os.remove(nc_file_path)
+
+    @staticmethod
+    def worker_name(pid=None):
+        return f"{socket.gethostname()}:{pid or os.getpid()}"
+
+    def fail_orphaned(self):
+        """Fail ``processing`` jobs whose web worker on this host has exited; returns how many
+
+        Jobs of workers on other hosts are left alone, since their processes
+        cannot be checked from here. Jobs recorded without a worker predate
+        the field and are failed as well.
+        """
+        host = socket.gethostname()
+        orphaned = []
+        for job in self.collection.find({'status': 'processing'}, {'worker': 1}):
+            worker = job.get('worker')
+            if worker:
+                worker_host, _, pid = worker.rpartition(':')
+                if worker_host != host or _process_alive(int(pid)):
+                    continue
+            orphaned.append(job['_id'])
+
+        if orphaned:
+            now = datetime.utcnow()
+            self.collection.update_many(
+                {'_id': {'$in': orphaned}, 'status': 'processing'},
+                {'$set': {'status': 'failed', 'error': 'Interrupted by a server restart',
+                          'completed_at': now, 'timestamp': now}})
+            logger.warning(f"Marked {len(orphaned)} interrupted conversion jobs as failed")
+        return len(orphaned)
+
+    def get(self, job_id):
+        """Return the job document, or None for an unknown or malformed id"""
+        try:
+            return self.collection.find_one({'_id': ObjectId(job_id)})
+        except (InvalidId, TypeError):
+            return None
+
+    @staticmethod
+    def serialize(job):
+        """JSON-friendly view of a job document"""
+        submitted_at = job.get('submitted_at')
+        completed_at = job.get('completed_at')
+        finished = completed_at or datetime.utcnow()
+
+        return {
+            'job_id': str(job['_id']),
+            'kind': job.get('kind', 'conversion'),
+            'status': job['status'],
+            'original_file': job.get('original_file'),
+            'output_file': job.get('output_file'),
+            'output_format': job.get('output_format'),
+            'rows': job.get('rows'),
+            'columns': job.get('columns'),
+            'error': job.get('error'),
+            'result': job.get('result'),
+            'submitted_at': submitted_at.isoformat() if submitted_at else None,
+            'completed_at': completed_at.isoformat() if completed_at else None,
+            'elapsed_seconds': (finished - submitted_at).total_seconds() if submitted_at else None
+        }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+            if self._ingest_executor is not None:
+                self._ingest_executor.shutdown(wait=wait)
+                self._ingest_executor = None
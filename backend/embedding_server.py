@@ -0,0 +1,265 @@
+import os
+import json
+import itertools
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Frame header: lengths of the JSON part and of the binary payload
+FRAME_HEADER = struct.Struct('!II')
+
+DEFAULT_SOCKET_PATH = '/tmp/floatchat-embeddings.sock'
+
+def send_frame(sock, message, payload=b''):
+    """Send a JSON message followed by an optional binary payload"""
+    header = json.dumps(message).encode('utf-8')
+    sock.sendall(FRAME_HEADER.pack(len(header), len(payload)) + header + payload)
+
+def recv_frame(sock):
+    """Receive one frame; returns (message, payload) or None at end of stream"""
+    prefix = _recv_exact(sock, FRAME_HEADER.size)
+    if prefix is None:
+        return None
+    header_size, payload_size = FRAME_HEADER.unpack(prefix)
+    header = _recv_exact(sock, header_size)
+    payload = _recv_exact(sock, payload_size) if payload_size else b''
+    if header is None or payload is None:
+        raise ConnectionError('Connection closed mid-frame')
+    return json.loads(header.decode('utf-8')), payload
+
+def _recv_exact(sock, size):
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            return None
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+class MicroBatcher:
+    """Coalesce concurrent encode requests into batched model calls
+
+    The first waiting request opens a batch. Further requests join it
+    until it holds ``max_batch_size`` texts or ``max_wait`` seconds have
+    passed, then the whole batch is encoded in one call and each caller
+    gets its own rows back.
+
+    Interactive requests are served before ``bulk`` ones, so a chat query
+    waits for at most one model call of an ingestion job, not the job.
+    """
+
+    def __init__(self, encode, max_batch_size=64, max_wait=0.005):
+        self.encode = encode
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.texts = 0
+        self._queue = queue.PriorityQueue()
+        self._order = itertools.count()
+        threading.Thread(target=self._run, name='embedding-batcher', daemon=True).start()
+
+    def submit(self, texts, bulk=False):
+        """Embed ``texts``; blocks until their batch has been encoded"""
+        request = {'texts': texts, 'done': threading.Event(), 'result': None, 'error': None}
+        self._queue.put((int(bulk), next(self._order), request))
+        request['done'].wait()
+        if request['error'] is not None:
+            raise request['error']
+        return request['result']
+
+    def _collect(self):
+        batch = [self._queue.get()[2]]
+        count = len(batch[0]['texts'])
+        deadline = time.monotonic() + self.max_wait
+
+        while count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                bulk, order, request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if count + len(request['texts']) > self.max_batch_size:
+                # Leave it for the next batch rather than exceed the batch size
+                self._queue.put((bulk, order, request))
+                break
+            batch.append(request)
+            count += len(request['texts'])
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for request in batch for text in request['texts']]
+
+            try:
+                embeddings = np.asarray(self.encode(texts, batch_size=self.max_batch_size),
+                                        dtype=np.float32)
+                offset = 0
+                for request in batch:
+                    request['result'] = embeddings[offset:offset + len(request['texts'])]
+                    offset += len(request['texts'])
+            except Exception as e:
+                logger.error(f"Encoding a batch of {len(texts)} texts failed: {str(e)}")
+                for request in batch:
+                    request['error'] = e
+
+            self.batches += 1
+            self.texts += len(texts)
+            for request in batch:
+                request['done'].set()
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Sentence embedding sidecar shared by the web workers over a Unix socket
+
+    One process holds the model, so memory does not grow with the number
+    of gunicorn workers, and queries arriving together from different
+    workers are encoded as one batch.
+    """
+
+    daemon_threads = True
+    # Every thread of every web worker holds a connection
+    request_queue_size = 128
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, model_name='all-MiniLM-L6-v2',
+                 max_batch_size=64, max_wait=0.005):
+        # Imported here so that clients do not load torch
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.batcher = MicroBatcher(self.model.encode, max_batch_size, max_wait)
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, EmbeddingRequestHandler)
+        os.chmod(socket_path, 0o600)
+
+class EmbeddingRequestHandler(socketserver.BaseRequestHandler):
+    """Serve encode requests on one worker connection until it closes"""
+
+    def handle(self):
+        while True:
+            try:
+                frame = recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+            if frame is None:
+                return
+
+            message, _ = frame
+            try:
+                embeddings = self.server.batcher.submit(message['texts'], bool(message.get('bulk')))
+            except Exception as e:
+                reply = ({'error': str(e)}, b'')
+            else:
+                reply = ({'shape': list(embeddings.shape)}, embeddings.tobytes())
+
+            try:
+                send_frame(self.request, *reply)
+            except OSError:
+                # The client timed out and closed its connection
+                return
+
+class EmbeddingClient:
+    """Stand-in for SentenceTransformer that encodes through an EmbeddingServer
+
+    Long lists are sent in frames of ``batch_size`` texts, so each frame is
+    one model call and the ``timeout`` applies per frame. Lists of more
+    than one text are marked as bulk work, which the server queues behind
+    single queries. Each thread keeps its own connection; a request is
+    sent again on a new connection only if the old one was found closed,
+    never after a timeout, since the server may still be encoding it.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, timeout=30, batch_size=64):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._local = threading.local()
+
+    def _connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _request(self, texts, bulk):
+        sock = self._connection()
+        send_frame(sock, {'texts': texts, 'bulk': bulk})
+        frame = recv_frame(sock)
+        if frame is None:
+            raise ConnectionError('Embedding server closed the connection')
+        return frame
+
+    def _encode_frame(self, texts, bulk):
+        try:
+            message, payload = self._request(texts, bulk)
+        except socket.timeout:
+            # A late reply would be read as the answer to the next request
+            self._close()
+            raise
+        except (ConnectionError, OSError):
+            # Server restarted or not reachable; a closed connection got no work done
+            self._close()
+            message, payload = self._request(texts, bulk)
+
+        if 'error' in message:
+            raise RuntimeError(f"Embedding server error: {message['error']}")
+        return np.frombuffer(payload, dtype=np.float32).reshape(message['shape'])
+
+    def encode(self, texts, batch_size=None, **kwargs):
+        """Embed a list of texts as a float32 array"""
+        texts = list(texts)
+        batch_size = batch_size or self.batch_size
+        bulk = len(texts) > 1
+        frames = [self._encode_frame(texts[start:start + batch_size], bulk)
+                  for start in range(0, len(texts), batch_size) or [0]]
+        return frames[0] if len(frames) == 1 else np.vstack(frames)
+
+def main():
+    """Run the embedding server"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='FloatChat embedding server')
+    parser.add_argument('--socket', default=os.environ.get('EMBEDDING_SERVER_SOCKET') or DEFAULT_SOCKET_PATH,
+                        help='Unix socket path to listen on')
+    parser.add_argument('--model', default=os.environ.get('VECTOR_MODEL') or 'all-MiniLM-L6-v2')
+    parser.add_argument('--max-batch-size', type=int, default=64,
+                        help='Most texts encoded in one model call')
+    parser.add_argument('--max-wait-ms', type=float, default=5,
+                        help='Longest a query waits for others to join its batch')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    server = EmbeddingServer(args.socket, args.model, args.max_batch_size, args.max_wait_ms / 1000)
+    logger.info(f"Embedding server for {args.model} listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+
+if __name__ == "__main__":
+    main()
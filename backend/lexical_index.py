@@ -0,0 +1,165 @@
+import re
+import math
+import threading
+from collections import defaultdict
+import numpy as np
+
+# Letters and digits; underscores and punctuation split tokens, so
+# "TEMP_ADJUSTED" matches "temp" and WMO numbers stay whole
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'do', 'for', 'from', 'how', 'i', 'in',
+    'is', 'it', 'me', 'of', 'on', 'or', 'show', 'that', 'the', 'this', 'to', 'what', 'which',
+    'with'
+))
+
+def tokenize(text):
+    """Lowercased terms of ``text`` without stopwords"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+class LexicalIndex:
+    """In-memory inverted index ranked with BM25
+
+    Documents are identified by the same integer ids as the vector index,
+    so lexical and vector rankings can be fused. Each document gets a slot
+    in numpy arrays of ids and lengths, and postings map slots to term
+    frequencies, so adding, replacing and removing a document only touches
+    its own terms. A query scores the postings of its terms with numpy;
+    the arrays of a term are built on first use and kept until one of its
+    documents changes.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._slots = {}
+        self._free = []
+        self._doc_ids = np.zeros(0, dtype=np.int64)
+        self._lengths = np.zeros(0, dtype=np.float32)
+        self._doc_terms = {}
+        self._postings = defaultdict(dict)
+        self._arrays = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def add(self, doc_id, text):
+        """Index ``text`` under ``doc_id``, replacing its previous text"""
+        self.add_many([(doc_id, text)])
+
+    def add_many(self, documents):
+        """Index (doc_id, text) pairs"""
+        tokenized = []
+        for doc_id, text in documents:
+            counts = defaultdict(int)
+            for token in tokenize(text):
+                counts[token] += 1
+            tokenized.append((int(doc_id), counts))
+
+        with self._lock:
+            self._reserve(len(self._slots) + len(self._free) + len(tokenized))
+            for doc_id, counts in tokenized:
+                self._remove(doc_id)
+                slot = self._free.pop() if self._free else len(self._slots)
+                length = sum(counts.values())
+                self._slots[doc_id] = slot
+                self._doc_ids[slot] = doc_id
+                self._lengths[slot] = length
+                self._total_length += length
+                self._doc_terms[slot] = tuple(counts)
+                for token, count in counts.items():
+                    self._postings[token][slot] = count
+                    self._arrays.pop(token, None)
+
+    def _reserve(self, size):
+        if size > len(self._doc_ids):
+            capacity = max(size, 2 * len(self._doc_ids), 1024)
+            self._doc_ids = np.resize(self._doc_ids, capacity)
+            self._lengths = np.resize(self._lengths, capacity)
+
+    def remove(self, doc_ids):
+        """Drop documents from the index; unknown ids are ignored"""
+        with self._lock:
+            for doc_id in doc_ids:
+                self._remove(int(doc_id))
+
+    def _remove(self, doc_id):
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return
+        for token in self._doc_terms.pop(slot):
+            postings = self._postings[token]
+            del postings[slot]
+            if not postings:
+                del self._postings[token]
+            self._arrays.pop(token, None)
+        self._total_length -= int(self._lengths[slot])
+        self._lengths[slot] = 0
+        self._free.append(slot)
+
+    def clear(self):
+        with self._lock:
+            self._slots.clear()
+            self._free = []
+            self._doc_terms.clear()
+            self._postings.clear()
+            self._arrays.clear()
+            self._total_length = 0
+
+    def _term_arrays(self, token):
+        arrays = self._arrays.get(token)
+        if arrays is None:
+            postings = self._postings[token]
+            arrays = (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                      np.fromiter(postings.values(), dtype=np.float32, count=len(postings)))
+            self._arrays[token] = arrays
+        return arrays
+
+    def search(self, query, k=10, ids=None):
+        """Best ``k`` (doc_id, score) pairs for ``query``, highest score first
+
+        ``ids`` restricts the search to a collection of document ids.
+        """
+        tokens = set(tokenize(query))
+
+        with self._lock:
+            count = len(self._slots)
+            tokens = [token for token in tokens if token in self._postings]
+            if not count or not tokens:
+                return []
+            average_length = self._total_length / count
+
+            scores = np.zeros(len(self._slots) + len(self._free), dtype=np.float32)
+            for token in tokens:
+                slots, frequencies = self._term_arrays(token)
+                idf = math.log(1 + (count - len(slots) + 0.5) / (len(slots) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[slots] / average_length)
+                scores[slots] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+
+            if ids is not None:
+                allowed = [self._slots[doc_id] for doc_id in ids if doc_id in self._slots]
+                mask = np.zeros(len(scores), dtype=bool)
+                mask[allowed] = True
+                scores[~mask] = 0
+
+            matched = np.flatnonzero(scores)
+            if len(matched) > k:
+                matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+            matched = matched[np.argsort(-scores[matched], kind='stable')]
+            return [(int(self._doc_ids[slot]), float(scores[slot])) for slot in matched]
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """Fuse ranked lists of doc ids into one list of (doc_id, score)
+
+    Each list adds ``1 / (k + rank)`` for the documents it contains, so
+    documents ranked well by several retrievers come first without having
+    to compare BM25 scores with vector distances.
+    """
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
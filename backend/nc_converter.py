@@ -1,7 +1,13 @@
 import xarray as xr
 import pandas as pd
 import numpy as np
+import netCDF4
 import os
+import json
+import hashlib
+import sqlite3
+import itertools
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 import logging
 
@@ -9,13 +15,171 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Supported output formats and their file extensions
+OUTPUT_FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather'
+}
+
+# Default compression codecs for the columnar formats
+DEFAULT_COMPRESSION = {
+    'parquet': 'snappy',
+    'feather': 'lz4'
+}
+
+# ARGO character variables that hold identifiers, codes or flags. They are
+# decoded to text but never coerced to numbers, even when they look numeric
+# (PLATFORM_NUMBER, WMO_INST_TYPE) or happen to be all digits (QC flags).
+ARGO_TEXT_VARIABLES = {
+    'PLATFORM_NUMBER', 'PROJECT_NAME', 'PI_NAME', 'STATION_PARAMETERS',
+    'DATA_CENTRE', 'DC_REFERENCE', 'DATA_STATE_INDICATOR', 'DATA_MODE',
+    'DIRECTION', 'PLATFORM_TYPE', 'FLOAT_SERIAL_NO', 'FIRMWARE_VERSION',
+    'WMO_INST_TYPE', 'POSITIONING_SYSTEM', 'VERTICAL_SAMPLING_SCHEME',
+    'DATA_TYPE', 'FORMAT_VERSION', 'HANDBOOK_VERSION', 'PARAMETER'
+}
+ARGO_TEXT_PREFIXES = ('HISTORY_', 'SCIENTIFIC_CALIB_')
+ARGO_TEXT_SUFFIXES = ('_QC',)
+
+# Decimal places kept for floating point columns
+FLOAT_PRECISION = 6
+
+# Named variable selections for ``NetCDFConverter(preset=...)``
+PROJECTION_PRESETS = {
+    # Core temperature/salinity profile: position, time and the PRES/TEMP/PSAL
+    # measurements with their adjusted values and QC flags
+    'core_ts': [
+        'PLATFORM_NUMBER', 'CYCLE_NUMBER', 'DIRECTION', 'DATA_MODE',
+        'JULD', 'JULD_QC', 'LATITUDE', 'LONGITUDE', 'POSITION_QC',
+        'PRES', 'PRES_QC', 'PRES_ADJUSTED', 'PRES_ADJUSTED_QC',
+        'TEMP', 'TEMP_QC', 'TEMP_ADJUSTED', 'TEMP_ADJUSTED_QC',
+        'PSAL', 'PSAL_QC', 'PSAL_ADJUSTED', 'PSAL_ADJUSTED_QC'
+    ]
+}
+
+# ARGO data modes whose adjusted values (and adjusted QC) are authoritative
+ADJUSTED_DATA_MODES = ('A', 'D')
+
+# Slice size along ``chunk_dim`` used by lazy mode when none is given
+DEFAULT_LAZY_CHUNK_SIZE = 100
+
+# Variables holding time and position, in order of preference
+TIME_VARIABLES = ['time', 'JULD']
+LATITUDE_VARIABLES = ['latitude', 'lat', 'LATITUDE']
+LONGITUDE_VARIABLES = ['longitude', 'lon', 'LONGITUDE']
+
+# Catalogue file extensions stored as SQLite; anything else is JSON lines
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+# Manifest used by incremental batch conversion, kept in the output folder
+MANIFEST_FILENAME = '.conversion_manifest.json'
+
+class FrameWriter:
+    """Append DataFrame chunks to a CSV, Parquet or Feather file
+
+    The columnar formats go through pyarrow, which is only imported when
+    one of them is requested. The schema of the first chunk is kept for
+    the whole file, so typed columns survive and later chunks are cast
+    to match.
+    """
+
+    def __init__(self, path, output_format='csv', compression=None):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        self.path = path
+        self.output_format = output_format
+        self.compression = compression or DEFAULT_COMPRESSION.get(output_format)
+        self._handle = None
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        if self.output_format == 'csv':
+            header = self._handle is None
+            if self._handle is None:
+                self._handle = open(self.path, 'w', newline='')
+            df.to_csv(self._handle, index=False, header=header)
+            return
+
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            self._writer = self._open_arrow_writer(self._schema)
+        elif not table.schema.equals(self._schema):
+            table = table.cast(self._schema)
+
+        self._writer.write_table(table)
+
+    def _open_arrow_writer(self, schema):
+        import pyarrow as pa
+
+        if self.output_format == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(self.path, schema, compression=self.compression)
+
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        return pa.ipc.new_file(self.path, schema, options=options)
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
 class NetCDFConverter:
-    """Converter for ARGO NetCDF files to CSV format"""
+    """Converter for ARGO NetCDF files to CSV, Parquet or Feather format"""
+
+    def __init__(self, upload_folder='uploads', output_folder=None,
+                 chunk_size=None, chunk_dim='N_PROF',
+                 output_format='csv', compression=None,
+                 manifest_path=None, hash_inputs=False, lazy=False,
+                 variables=None, preset=None, qc_flags=None):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        if preset is not None and preset not in PROJECTION_PRESETS:
+            raise ValueError(f"Unknown projection preset: {preset}")
 
-    def __init__(self, upload_folder='uploads', output_folder=None):
         self.upload_folder = upload_folder
         self.output_folder = output_folder or upload_folder
 
+        # Incremental batch conversion: where results are remembered and
+        # whether a changed size/mtime is double-checked with a content hash
+        self.manifest_path = manifest_path or os.path.join(self.output_folder, MANIFEST_FILENAME)
+        self.hash_inputs = hash_inputs
+
+        # Output file format; compression only applies to parquet/feather
+        self.output_format = output_format
+        self.compression = compression
+
+        # Streaming mode: write the output in slices of ``chunk_size``
+        # entries along ``chunk_dim`` instead of building one DataFrame
+        self.chunk_size = chunk_size
+        self.chunk_dim = chunk_dim
+
+        # Lazy mode: open files as dask arrays chunked along ``chunk_dim``
+        # and stream them, so a file never has to fit in memory at once
+        self.lazy = lazy
+        if lazy and not chunk_size:
+            self.chunk_size = DEFAULT_LAZY_CHUNK_SIZE
+
+        # Projection: only these variables are read and exported (None keeps
+        # everything), and only levels whose QC flags are all in ``qc_flags``
+        selected = list(variables or [])
+        if preset:
+            selected += [v for v in PROJECTION_PRESETS[preset] if v not in selected]
+        self.variables = selected or None
+        self.preset = preset
+        self.qc_flags = [str(flag) for flag in qc_flags] if qc_flags else None
+
         # Create directories if they don't exist
         os.makedirs(self.upload_folder, exist_ok=True)
         os.makedirs(self.output_folder, exist_ok=True)
@@ -26,27 +190,34 @@ class NetCDFConverter:
             logger.info(f"Converting {nc_file_path}")
 
             # Open NetCDF file
-            with xr.open_dataset(nc_file_path) as ds:
-                # Convert to DataFrame
-                df = ds.to_dataframe().reset_index()
-
-                # Clean up DataFrame (remove NaN-only columns, etc.)
-                df = self._clean_dataframe(df)
-
+            with self._open_dataset(nc_file_path) as ds:
                 # Generate output path if not provided
                 if not output_path:
                     base_name = os.path.splitext(os.path.basename(nc_file_path))[0]
-                    output_path = os.path.join(self.output_folder, f"{base_name}.csv")
+                    extension = OUTPUT_FORMATS[self.output_format]
+                    output_path = os.path.join(self.output_folder, f"{base_name}{extension}")
+
+                if self.chunk_size and self.chunk_dim in ds.sizes:
+                    # Stream slices to disk without materializing the full frame
+                    rows, columns = self._write_chunked(ds, output_path)
+                else:
+                    # Clean variable by variable, then explode to a DataFrame
+                    ds, drop_columns = self._prepare_dataset(ds)
+                    df = self._to_frame(ds)
+                    df.drop(columns=drop_columns, inplace=True, errors='ignore')
 
-                # Save to CSV
-                df.to_csv(output_path, index=False)
+                    # Save in the requested format
+                    with self._writer(output_path) as writer:
+                        writer.write(df)
+                    rows, columns = len(df), len(df.columns)
 
                 result = {
                     'success': True,
                     'input_file': nc_file_path,
                     'output_file': output_path,
-                    'rows': len(df),
-                    'columns': len(df.columns),
+                    'rows': rows,
+                    'columns': columns,
+                    'output_format': self.output_format,
                     'file_size_mb': os.path.getsize(output_path) / (1024 * 1024),
                     'processed_at': datetime.utcnow().isoformat()
                 }
@@ -63,18 +234,63 @@ class NetCDFConverter:
                 'processed_at': datetime.utcnow().isoformat()
             }
 
-    def batch_convert(self, input_folder, file_pattern='*.nc'):
-        """Convert all NetCDF files in a folder"""
+    def batch_convert(self, input_folder, file_pattern='*.nc', workers=1, incremental=False):
+        """Convert all NetCDF files in a folder
+
+        With ``workers`` > 1 the files are converted in a process pool. Only
+        ``workers`` files are in flight at any time, so at most that many
+        datasets are held in memory no matter how large the folder is.
+
+        With ``incremental`` set, files whose fingerprint and converter
+        options match the manifest from a previous run (and whose output
+        still exists) are skipped, and their previous result is returned
+        with ``cached`` set.
+        """
         import glob
 
         # Find all NetCDF files
         nc_files = glob.glob(os.path.join(input_folder, file_pattern))
         logger.info(f"Found {len(nc_files)} NetCDF files to convert")
 
-        results = []
-        for nc_file in nc_files:
-            result = self.convert_single_file(nc_file)
-            results.append(result)
+        results = [None] * len(nc_files)
+        manifest = self._load_manifest() if incremental else None
+        fingerprints = {}
+
+        if manifest is not None:
+            for position, nc_file in enumerate(nc_files):
+                entry = manifest['files'].get(os.path.abspath(nc_file))
+                fingerprint = self._file_fingerprint(nc_file, entry)
+                fingerprints[nc_file] = fingerprint
+                if self._is_up_to_date(entry, fingerprint):
+                    # Remember a new mtime that the hash proved harmless
+                    entry['fingerprint'] = fingerprint
+                    results[position] = dict(entry['result'], cached=True)
+
+            skipped = sum(1 for r in results if r is not None)
+            logger.info(f"Skipping {skipped} unchanged files")
+
+        todo = [position for position, r in enumerate(results) if r is None]
+        todo_files = [nc_files[position] for position in todo]
+        if workers and workers > 1 and len(todo_files) > 1:
+            converted = run_in_pool(self.convert_single_file, todo_files, workers)
+        else:
+            converted = [self.convert_single_file(nc_file) for nc_file in todo_files]
+
+        for position, result in zip(todo, converted):
+            results[position] = result
+
+        if manifest is not None:
+            for nc_file, result in zip(todo_files, converted):
+                key = os.path.abspath(nc_file)
+                if result['success']:
+                    manifest['files'][key] = {
+                        'fingerprint': fingerprints[nc_file],
+                        'options': self._options_key(),
+                        'result': result
+                    }
+                else:
+                    manifest['files'].pop(key, None)
+            self._save_manifest(manifest)
 
         # Summary statistics
         successful = sum(1 for r in results if r['success'])
@@ -90,25 +306,321 @@ class NetCDFConverter:
             'summary': self._generate_summary(results)
         }
 
-    def _clean_dataframe(self, df):
-        """Clean and optimize DataFrame"""
-        # Remove columns that are entirely NaN
-        df = df.dropna(axis=1, how='all')
+    def _open_dataset(self, nc_file_path):
+        """Open a NetCDF file, backed by dask arrays in lazy mode
 
-        # Convert object columns to appropriate types where possible
-        for col in df.select_dtypes(include=['object']).columns:
+        With a projection, variables outside it are passed to xarray as
+        ``drop_variables`` so they are never decoded or read. The QC flags
+        that ``qc_flags`` filters on are read even when the projection
+        leaves them out; ``_to_frame`` drops them after filtering.
+        """
+        kwargs = {}
+        if self.variables:
+            kwargs['drop_variables'] = self._unselected_variables(nc_file_path)
+
+        if self.lazy:
             try:
-                # Try to convert to numeric
-                df[col] = pd.to_numeric(df[col], errors='ignore')
-            except:
-                pass
+                import dask  # noqa: F401
+            except ImportError:
+                raise ImportError("Lazy conversion requires dask (pip install dask)")
+            kwargs['chunks'] = {self.chunk_dim: self.chunk_size}
+
+        return xr.open_dataset(nc_file_path, **kwargs)
+
+    def _unselected_variables(self, nc_file_path):
+        """Names in the file header that the projection does not keep"""
+        with netCDF4.Dataset(nc_file_path) as nc:
+            names = list(nc.variables)
+            dims = set(nc.dimensions)
+
+        keep = set(self.variables)
+        if self.qc_flags:
+            keep.update(self._qc_variables(names))
+        return [name for name in names if name not in keep and name not in dims]
+
+    def _qc_variables(self, names):
+        """Of ``names``, the QC flags and DATA_MODE that filtering the projection needs"""
+        needed = {'DATA_MODE'}
+        for name in self.variables:
+            if name.endswith('_QC'):
+                continue
+            base = name[:-len('_ADJUSTED')] if name.endswith('_ADJUSTED') else name
+            needed.update((f"{base}_QC", f"{base}_ADJUSTED_QC"))
+        return [name for name in names if name in needed]
+
+    def _to_frame(self, ds, dim_order=None):
+        """Explode a dataset into rows, skipping levels rejected by ``qc_flags``
+
+        The QC mask is computed on the (N_PROF, N_LEVELS) flag arrays and the
+        surviving levels are picked with a pointwise ``isel``, so rejected
+        levels are never turned into rows. Rows keep the N_PROF/N_LEVELS
+        columns of the unfiltered layout and follow the same order.
+        """
+        if not self.qc_flags:
+            return ds.to_dataframe(dim_order=dim_order).reset_index()
+
+        mask = self._qc_mask(ds)
+        if self.variables:
+            # QC flags read only for filtering are not exported
+            ds = ds.drop_vars([name for name in ds.data_vars if name not in self.variables])
+
+        dims = list(dim_order or ds.sizes)
+        for dim in ('N_PROF', 'N_LEVELS'):
+            if dim not in ds.coords:
+                ds = ds.assign_coords({dim: np.arange(ds.sizes[dim])})
+
+        prof, level = np.nonzero(mask)
+        ds = ds.isel(N_PROF=xr.DataArray(prof, dims='row'),
+                     N_LEVELS=xr.DataArray(level, dims='row'))
+
+        order = ['row' if dim == 'N_PROF' else dim for dim in dims if dim != 'N_LEVELS']
+        df = ds.to_dataframe(dim_order=order).reset_index()
+        del df['row']
+
+        leading = [dim for dim in dims if dim in df.columns]
+        for position, dim in enumerate(leading):
+            df.insert(position, dim, df.pop(dim))
+        return df
+
+    def _qc_mask(self, ds):
+        """Boolean (N_PROF, N_LEVELS) mask of levels whose QC flags all pass
+
+        For each measured parameter the ARGO convention is followed: the
+        adjusted QC flag is used for profiles in adjusted or delayed mode
+        (DATA_MODE 'A' or 'D') and the real-time flag otherwise. Flags are
+        compared as decoded text, so a blank flag is ''. Raises ValueError
+        when the dataset has no level QC variables to filter on, rather than
+        exporting unfiltered data.
+        """
+        if 'N_PROF' not in ds.sizes or 'N_LEVELS' not in ds.sizes:
+            raise ValueError('qc_flags needs ARGO profile data with N_PROF and N_LEVELS dimensions')
+
+        qc_names = [name for name in ds.data_vars
+                    if name.endswith('_QC') and not name.endswith('_ADJUSTED_QC')
+                    and set(ds[name].dims) == {'N_PROF', 'N_LEVELS'}]
+        if not qc_names:
+            measured = [name for name in ds.data_vars if not name.endswith('_QC')
+                        and set(ds[name].dims) == {'N_PROF', 'N_LEVELS'}]
+            expected = ', '.join(f"{name}_QC" for name in measured) or '<variable>_QC'
+            raise ValueError(f"qc_flags needs level QC variables ({expected}), which the file does not have")
+
+        adjusted = None
+        if 'DATA_MODE' in ds.data_vars:
+            data_mode = np.asarray(ds['DATA_MODE'].values)
+            adjusted = np.isin(data_mode, ADJUSTED_DATA_MODES)[:, np.newaxis]
+
+        mask = np.ones((ds.sizes['N_PROF'], ds.sizes['N_LEVELS']), dtype=bool)
+        for name in qc_names:
+            flags = np.asarray(ds[name].transpose('N_PROF', 'N_LEVELS').values)
+            adjusted_name = name[:-len('_QC')] + '_ADJUSTED_QC'
+            if adjusted is not None and adjusted_name in ds.data_vars:
+                adjusted_flags = ds[adjusted_name].transpose('N_PROF', 'N_LEVELS').values
+                flags = np.where(adjusted, adjusted_flags, flags)
+            mask &= np.isin(flags, self.qc_flags)
+
+        return mask
+
+    def _writer(self, output_path):
+        return FrameWriter(output_path, self.output_format, self.compression)
+
+    def _write_chunked(self, ds, output_path):
+        """Write ``ds`` to the output file one ``chunk_dim`` slice at a time
+
+        Peak memory is bounded by the exploded size of a single slice. The
+        slices are cut from the already cleaned dataset, so the file matches
+        the one-shot path byte for byte as long as ``chunk_dim`` is the
+        leading dimension, which N_PROF is for ARGO profile files. Any other
+        dimension is moved to the front, grouping the rows by it instead.
+        """
+        ds, drop_columns = self._prepare_dataset(ds)
+        dim_order = [self.chunk_dim] + [d for d in ds.sizes if d != self.chunk_dim]
+        total = ds.sizes[self.chunk_dim]
+
+        # Without a coordinate each slice would number its rows from zero
+        if self.chunk_dim not in ds.coords:
+            ds = ds.assign_coords({self.chunk_dim: np.arange(total)})
+
+        rows = 0
+        columns = 0
+        with self._writer(output_path) as writer:
+            for start in range(0, max(total, 1), self.chunk_size):
+                chunk = ds.isel({self.chunk_dim: slice(start, start + self.chunk_size)})
+                df = self._to_frame(chunk, dim_order)
+                df.drop(columns=drop_columns, inplace=True, errors='ignore')
+
+                writer.write(df)
+                rows += len(df)
+                columns = len(df.columns)
+                del df
+
+        return rows, columns
+
+    def _prepare_dataset(self, ds):
+        """Clean a dataset variable by variable before it becomes a DataFrame
+
+        This is the dataset-level counterpart of ``_clean_dataframe``. Every
+        value of a frame column comes from its variable, so cleaning the
+        variables gives the same frame while touching each value once
+        instead of once per row of the N_PROF x N_LEVELS x ... explosion.
+
+        Returns the cleaned dataset and the all-NaN columns that still have
+        to be dropped from the frame. Those are variables that are the only
+        users of a dimension: removing them up front would also remove that
+        dimension from the row product.
+
+        For a dask-backed dataset the all-NaN check runs as a single graph
+        and the rounding/decoding is attached lazily per block, so nothing
+        is loaded until a slice is written. Only free text that may turn
+        out to be numeric is loaded here, since that decision needs every
+        value; ARGO keeps such variables small.
+        """
+        ds = ds.reset_coords()
+        drop = [name for name, missing in ds.isnull().all().compute().data_vars.items()
+                if ds[name].size and bool(missing)]
+        cleaned = {}
+        for name, var in ds.data_vars.items():
+            if name in drop:
+                continue
+
+            kind = var.dtype.kind
+            if var.chunks is not None and (kind not in 'OSU' or _is_argo_text(name)):
+                dtype = object if kind in 'OSU' else var.dtype
+                data = var.data.map_blocks(self._transform_values, name, dtype=dtype)
+                cleaned[name] = var.copy(data=data)
+                continue
+
+            original = var.values
+            values = self._transform_values(original, name)
+            if values is not original:
+                cleaned[name] = var.copy(data=values)
+
+        kept_dims = set()
+        for name, var in ds.data_vars.items():
+            if name not in drop:
+                kept_dims.update(var.dims)
+        drop_early = [name for name in drop if set(ds[name].dims) <= kept_dims]
+
+        ds = ds.assign(cleaned).drop_vars(drop_early)
+        return ds, [name for name in drop if name not in drop_early]
+
+    def _options_key(self):
+        """Converter options that affect what a conversion writes"""
+        return {
+            'output_folder': os.path.abspath(self.output_folder),
+            'output_format': self.output_format,
+            'compression': self.compression,
+            'chunk_size': self.chunk_size,
+            'chunk_dim': self.chunk_dim,
+            'lazy': self.lazy,
+            'variables': self.variables,
+            'qc_flags': self.qc_flags
+        }
+
+    def _file_fingerprint(self, nc_file_path, entry=None):
+        """Size and mtime of a file, plus its SHA-256 when ``hash_inputs`` is set
+
+        The hash is only computed when size/mtime differ from the manifest
+        ``entry`` (or the entry lacks a hash), so an archive that was merely
+        re-synced or touched is recognised without re-reading every file.
+        """
+        stat = os.stat(nc_file_path)
+        fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+        if self.hash_inputs:
+            previous = (entry or {}).get('fingerprint', {})
+            if (previous.get('sha256')
+                    and previous.get('size') == fingerprint['size']
+                    and previous.get('mtime_ns') == fingerprint['mtime_ns']):
+                fingerprint['sha256'] = previous['sha256']
+            else:
+                digest = hashlib.sha256()
+                with open(nc_file_path, 'rb') as f:
+                    for block in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(block)
+                fingerprint['sha256'] = digest.hexdigest()
+
+        return fingerprint
+
+    def _is_up_to_date(self, entry, fingerprint):
+        """Whether a manifest entry can stand in for converting the file again"""
+        if not entry or entry.get('options') != self._options_key():
+            return False
+
+        output_file = entry['result'].get('output_file')
+        if not output_file or not os.path.exists(output_file):
+            return False
+
+        previous = entry['fingerprint']
+        if 'sha256' in fingerprint and 'sha256' in previous:
+            return fingerprint['sha256'] == previous['sha256']
+        return (fingerprint['size'] == previous.get('size')
+                and fingerprint['mtime_ns'] == previous.get('mtime_ns'))
+
+    def _load_manifest(self):
+        """Load the incremental conversion manifest, or start an empty one"""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if isinstance(manifest.get('files'), dict):
+                return manifest
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.manifest_path}: {str(e)}")
+
+        return {'version': 1, 'files': {}}
+
+    def _save_manifest(self, manifest):
+        """Write the manifest atomically so an interrupted run cannot corrupt it"""
+        manifest['updated_at'] = datetime.utcnow().isoformat()
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _clean_dataframe(self, df):
+        """Clean and optimize DataFrame
 
-        # Round numeric columns to reasonable precision
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        df[numeric_cols] = df[numeric_cols].round(6)
+        Single pass over the columns, replacing one column at a time rather
+        than copying the whole frame per step: all-NaN columns are dropped,
+        ARGO char arrays are decoded to text, numeric text is converted and
+        floats are rounded.
+        """
+        for col in list(df.columns):
+            original = df[col].to_numpy()
+            values = self._clean_values(col, original)
+            if values is None:
+                del df[col]
+            elif values is not original:
+                df[col] = values
 
         return df
 
+    def _clean_values(self, name, values):
+        """Clean the values of one column or variable
+
+        Returns None when every value is missing, the input array itself when
+        nothing needed changing, and a new array otherwise.
+        """
+        if values.size and pd.isna(values).all():
+            return None
+        return self._transform_values(values, name)
+
+    def _transform_values(self, values, name):
+        """Round floats and decode text; element-wise except numeric coercion"""
+        kind = values.dtype.kind
+
+        if kind == 'f':
+            return np.round(values, FLOAT_PRECISION)
+
+        if kind in 'OSU':
+            values = _decode_text(values)
+            if not _is_argo_text(name):
+                values = _coerce_numeric(values)
+            return values
+
+        return values
+
     def _generate_summary(self, results):
         """Generate summary statistics from conversion results"""
         successful_results = [r for r in results if r['success']]
@@ -127,10 +639,18 @@ class NetCDFConverter:
             'processing_time': datetime.utcnow().isoformat()
         }
 
-    def get_nc_file_info(self, nc_file_path):
-        """Get detailed information about a NetCDF file"""
+    def get_nc_file_info(self, nc_file_path, fast=False):
+        """Get detailed information about a NetCDF file
+
+        ``fast`` reads only the header and the time/position variables
+        through netCDF4 (see ``_fast_file_info``) instead of opening the
+        dataset with xarray.
+        """
+        if fast:
+            return self._fast_file_info(nc_file_path)
+
         try:
-            with xr.open_dataset(nc_file_path) as ds:
+            with self._open_dataset(nc_file_path) as ds:
                 info = {
                     'filename': os.path.basename(nc_file_path),
                     'file_size_mb': os.path.getsize(nc_file_path) / (1024 * 1024),
@@ -149,6 +669,121 @@ class NetCDFConverter:
                 'error': str(e)
             }
 
+    def _fast_file_info(self, nc_file_path):
+        """Header-only variant of ``get_nc_file_info``
+
+        Dimensions, variable names and attributes come from the file header.
+        Only the time and position variables are read (one value per
+        profile in ARGO files), and only their min/max are decoded. The
+        result has the same keys as the xarray path.
+        """
+        try:
+            with netCDF4.Dataset(nc_file_path) as nc:
+                coordinates = [name for name in nc.variables if name in nc.dimensions]
+                for variable in nc.variables.values():
+                    for name in getattr(variable, 'coordinates', '').split():
+                        if name in nc.variables and name not in coordinates:
+                            coordinates.append(name)
+
+                return {
+                    'filename': os.path.basename(nc_file_path),
+                    'file_size_mb': os.path.getsize(nc_file_path) / (1024 * 1024),
+                    'dimensions': {name: len(dim) for name, dim in nc.dimensions.items()},
+                    'coordinates': coordinates,
+                    'data_variables': [name for name in nc.variables if name not in coordinates],
+                    'global_attributes': {name: _jsonable(nc.getncattr(name)) for name in nc.ncattrs()},
+                    'time_range': self._fast_time_range(nc),
+                    'spatial_bounds': self._fast_spatial_bounds(nc)
+                }
+
+        except Exception as e:
+            return {
+                'filename': os.path.basename(nc_file_path),
+                'error': str(e)
+            }
+
+    def _fast_time_range(self, nc):
+        """Time range from the raw time variable, decoding only its extremes"""
+        variable = _first_variable(nc, TIME_VARIABLES)
+        if variable is None or not hasattr(variable, 'units'):
+            return None
+
+        values = _valid_values(variable)
+        if not values.size:
+            return None
+
+        calendar = getattr(variable, 'calendar', 'standard')
+        start, end = netCDF4.num2date([values.min(), values.max()], variable.units, calendar,
+                                      only_use_cftime_datetimes=False,
+                                      only_use_python_datetimes=True)
+        return {
+            'start': str(np.datetime64(start, 'ns')),
+            'end': str(np.datetime64(end, 'ns')),
+            'count': variable.size
+        }
+
+    def _fast_spatial_bounds(self, nc):
+        """Latitude/longitude bounds from the raw position variables"""
+        bounds = {}
+        for key, names in (('latitude', LATITUDE_VARIABLES), ('longitude', LONGITUDE_VARIABLES)):
+            variable = _first_variable(nc, names)
+            if variable is None:
+                continue
+            values = _valid_values(variable)
+            if values.size:
+                bounds[key] = {'min': float(values.min()), 'max': float(values.max())}
+
+        return bounds or None
+
+    def build_catalogue(self, input_folder, catalogue_path, file_pattern='*.nc', workers=1):
+        """Scan a folder into a metadata catalogue with the header-only reader
+
+        The catalogue is JSON lines, or an SQLite table with indexed time and
+        position columns when ``catalogue_path`` ends in .db/.sqlite. Files
+        whose size and mtime match their existing entry are not re-read, and
+        entries for files that disappeared are dropped. Files that failed to
+        open are recorded with their error but retried on every scan. Query
+        it with ``query_catalogue``.
+        """
+        import glob
+
+        nc_files = sorted(os.path.abspath(path)
+                          for path in glob.glob(os.path.join(input_folder, file_pattern)))
+        existing = load_catalogue(catalogue_path)
+
+        entries = {}
+        stale = []
+        for path in nc_files:
+            stat = os.stat(path)
+            entry = existing.get(path)
+            if (entry and 'error' not in entry
+                    and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns):
+                entries[path] = entry
+            else:
+                stale.append(path)
+
+        logger.info(f"Cataloguing {len(stale)} of {len(nc_files)} NetCDF files")
+
+        if workers and workers > 1 and len(stale) > 1:
+            infos = run_in_pool(self._fast_file_info, stale, workers)
+        else:
+            infos = [self._fast_file_info(path) for path in stale]
+
+        for path, info in zip(stale, infos):
+            if 'error' in info:
+                logger.error(f"Error reading {path}: {info['error']}")
+            stat = os.stat(path)
+            entries[path] = dict(info, path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+        save_catalogue(catalogue_path, [entries[path] for path in nc_files])
+
+        return {
+            'catalogue': catalogue_path,
+            'total_files': len(nc_files),
+            'scanned': len(stale),
+            'errors': sum(1 for info in infos if 'error' in info)
+        }
+
     def _get_time_range(self, ds):
         """Extract time range from dataset"""
         try:
@@ -202,27 +837,284 @@ class NetCDFConverter:
         except:
             return None
 
+def _first_variable(nc, names):
+    """First of ``names`` present in an open netCDF4 dataset, or None"""
+    for name in names:
+        if name in nc.variables:
+            return nc.variables[name]
+    return None
+
+def _valid_values(variable):
+    """Read a (small) netCDF4 variable as a flat array without fill values"""
+    values = np.ma.masked_invalid(np.ma.asarray(variable[:], dtype=np.float64))
+    return values.compressed()
+
+def _jsonable(value):
+    """Convert netCDF4 attribute values (numpy scalars/arrays) to JSON types"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def _is_argo_text(name):
+    """Whether an ARGO variable is an identifier or flag rather than a number"""
+    return (name in ARGO_TEXT_VARIABLES
+            or name.startswith(ARGO_TEXT_PREFIXES)
+            or name.endswith(ARGO_TEXT_SUFFIXES))
+
+def _decode_text(values):
+    """Decode bytes/char values to stripped strings
+
+    ARGO char arrays arrive as space padded bytes. Only the distinct values
+    are decoded in Python; ``pd.factorize`` maps them back onto the array in
+    one vectorized pass, which matters for QC flags with a handful of
+    distinct values over millions of levels. Missing values stay missing.
+    """
+    flat = values.ravel()
+    if flat.dtype.kind != 'O':
+        flat = flat.astype(object)
+
+    codes, uniques = pd.factorize(flat)
+    decoded = [u.decode('utf-8', 'replace').strip() if isinstance(u, bytes) else str(u).strip()
+               for u in uniques]
+    lookup = np.array(decoded + [np.nan], dtype=object)
+    return lookup[codes].reshape(values.shape)
+
+def _coerce_numeric(values):
+    """Convert text that is entirely numeric to numbers, else return it as is
+
+    Only the distinct values are parsed to find out whether the column is
+    numeric, so text columns are rejected cheaply.
+    """
+    try:
+        pd.to_numeric(pd.unique(values.ravel()))
+    except (ValueError, TypeError):
+        return values
+
+    converted = pd.to_numeric(values.ravel())
+    if converted.dtype.kind == 'f':
+        converted = np.round(converted, FLOAT_PRECISION)
+    return converted.reshape(values.shape)
+
+def run_in_pool(func, items, workers):
+    """Run ``func`` over ``items`` in a process pool, preserving input order
+
+    Submission is windowed: a new item is only handed to the pool when a
+    previous one finishes, so no more than ``workers`` items are ever in
+    flight. A worker that dies (e.g. killed by the OOM killer on a huge
+    file) is reported as a failed result instead of aborting the batch.
+    """
+    results = [None] * len(items)
+    pending = {}
+    queue = iter(enumerate(items))
+
+    def failed(item, error):
+        logger.error(f"Worker failed on {item}: {str(error)}")
+        return {
+            'success': False,
+            'input_file': item,
+            'error': str(error),
+            'processed_at': datetime.utcnow().isoformat()
+        }
+
+    def submit_next(executor, count):
+        for position, item in itertools.islice(queue, count):
+            try:
+                pending[executor.submit(func, item)] = position
+            except Exception as e:
+                # The pool is broken; nothing queued after this can run either
+                results[position] = failed(item, e)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        submit_next(executor, workers)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = pending.pop(future)
+                try:
+                    results[position] = future.result()
+                except Exception as e:
+                    results[position] = failed(items[position], e)
+                submit_next(executor, 1)
+
+            if not pending:
+                # Drain anything left over after a broken pool
+                submit_next(executor, len(items))
+
+    return results
+
+def split_list(value):
+    """Split a comma separated option into a list, or None when empty"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def _catalogue_is_sqlite(catalogue_path):
+    return catalogue_path.lower().endswith(SQLITE_EXTENSIONS)
+
+def _catalogue_row(entry):
+    """Flatten a catalogue entry into the indexed SQLite columns"""
+    time_range = entry.get('time_range') or {}
+    bounds = entry.get('spatial_bounds') or {}
+    lat = bounds.get('latitude') or {}
+    lon = bounds.get('longitude') or {}
+    return (
+        entry['path'], entry['filename'], entry['size'], entry['mtime_ns'],
+        time_range.get('start'), time_range.get('end'),
+        lat.get('min'), lat.get('max'), lon.get('min'), lon.get('max'),
+        json.dumps(entry)
+    )
+
+def load_catalogue(catalogue_path):
+    """Load every entry of a metadata catalogue, keyed by file path"""
+    if not os.path.exists(catalogue_path):
+        return {}
+
+    if _catalogue_is_sqlite(catalogue_path):
+        with sqlite3.connect(catalogue_path) as conn:
+            rows = conn.execute('SELECT info FROM nc_files').fetchall()
+        entries = [json.loads(row[0]) for row in rows]
+    else:
+        with open(catalogue_path, 'r') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+
+    return {entry['path']: entry for entry in entries}
+
+def save_catalogue(catalogue_path, entries):
+    """Write catalogue entries as JSON lines or, for .db/.sqlite, an SQLite table"""
+    tmp_path = f"{catalogue_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    if _catalogue_is_sqlite(catalogue_path):
+        with sqlite3.connect(tmp_path) as conn:
+            conn.execute(
+                'CREATE TABLE nc_files ('
+                ' path TEXT PRIMARY KEY, filename TEXT, size INTEGER, mtime_ns INTEGER,'
+                ' time_start TEXT, time_end TEXT,'
+                ' lat_min REAL, lat_max REAL, lon_min REAL, lon_max REAL, info TEXT)'
+            )
+            conn.execute('CREATE INDEX idx_nc_files_time ON nc_files (time_start, time_end)')
+            conn.execute('CREATE INDEX idx_nc_files_lat ON nc_files (lat_min, lat_max)')
+            conn.executemany('INSERT INTO nc_files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                             [_catalogue_row(entry) for entry in entries])
+        conn.close()
+    else:
+        with open(tmp_path, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+
+    os.replace(tmp_path, catalogue_path)
+
+def query_catalogue(catalogue_path, bbox=None, start=None, end=None):
+    """Find catalogued files overlapping a bounding box and/or time window
+
+    ``bbox`` is (min_lon, min_lat, max_lon, max_lat); ``start`` and ``end``
+    are ISO 8601 strings. Files without the relevant metadata never match
+    a filter on it. No NetCDF file is opened.
+    """
+    if _catalogue_is_sqlite(catalogue_path):
+        clauses, params = [], []
+        if bbox:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            clauses.append('lon_max >= ? AND lon_min <= ? AND lat_max >= ? AND lat_min <= ?')
+            params += [min_lon, max_lon, min_lat, max_lat]
+        if start:
+            clauses.append('time_end >= ?')
+            params.append(start)
+        if end:
+            clauses.append('time_start <= ?')
+            params.append(end)
+
+        sql = 'SELECT info FROM nc_files'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        with sqlite3.connect(catalogue_path) as conn:
+            rows = conn.execute(sql + ' ORDER BY path', params).fetchall()
+        conn.close()
+        return [json.loads(row[0]) for row in rows]
+
+    matches = []
+    for entry in sorted(load_catalogue(catalogue_path).values(), key=lambda e: e['path']):
+        _, _, _, _, time_start, time_end, lat_min, lat_max, lon_min, lon_max, _ = _catalogue_row(entry)
+        if bbox:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            if None in (lat_min, lon_min) or not (lon_max >= min_lon and lon_min <= max_lon
+                                                   and lat_max >= min_lat and lat_min <= max_lat):
+                continue
+        if start and (time_end is None or time_end < start):
+            continue
+        if end and (time_start is None or time_start > end):
+            continue
+        matches.append(entry)
+    return matches
+
 def main():
     """Command line interface for NetCDF converter"""
     import argparse
 
-    parser = argparse.ArgumentParser(description='Convert ARGO NetCDF files to CSV')
+    parser = argparse.ArgumentParser(description='Convert ARGO NetCDF files to CSV, Parquet or Feather')
     parser.add_argument('input', help='Input NetCDF file or directory')
     parser.add_argument('--output', help='Output directory (default: same as input)')
     parser.add_argument('--info', action='store_true', help='Show file info only')
+    parser.add_argument('--fast', action='store_true',
+                        help='With --info, read only the file header and coordinates')
+    parser.add_argument('--catalogue',
+                        help='Scan a directory into this metadata catalogue (.jsonl, or .db for SQLite)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of parallel conversion processes (default: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Skip files unchanged since the last run (directory input only)')
+    parser.add_argument('--manifest',
+                        help=f'Manifest file for --incremental (default: <output>/{MANIFEST_FILENAME})')
+    parser.add_argument('--hash', dest='hash_inputs', action='store_true',
+                        help='Confirm changed files with a SHA-256 content hash in --incremental mode')
+    parser.add_argument('--chunk-size', type=int,
+                        help='Stream the output in slices of this many entries along --chunk-dim')
+    parser.add_argument('--format', dest='output_format', default='csv',
+                        choices=sorted(OUTPUT_FORMATS),
+                        help='Output file format (default: csv)')
+    parser.add_argument('--compression',
+                        help='Compression codec for parquet/feather output (default: snappy/lz4)')
+    parser.add_argument('--lazy', action='store_true',
+                        help='Open files lazily with dask and stream them in --chunk-size slices')
+    parser.add_argument('--variables',
+                        help='Comma separated list of variables to export (default: all)')
+    parser.add_argument('--preset', choices=sorted(PROJECTION_PRESETS),
+                        help='Named variable selection, e.g. core_ts for PRES/TEMP/PSAL with QC')
+    parser.add_argument('--qc-flags',
+                        help='Comma separated QC flags to keep, e.g. 1,2; other levels are dropped')
+    parser.add_argument('--chunk-dim', default='N_PROF',
+                        help='Dimension to slice along in streaming mode (default: N_PROF)')
 
     args = parser.parse_args()
 
-    converter = NetCDFConverter(output_folder=args.output)
+    converter = NetCDFConverter(output_folder=args.output,
+                                chunk_size=args.chunk_size,
+                                chunk_dim=args.chunk_dim,
+                                output_format=args.output_format,
+                                compression=args.compression,
+                                manifest_path=args.manifest,
+                                hash_inputs=args.hash_inputs,
+                                lazy=args.lazy,
+                                variables=split_list(args.variables),
+                                preset=args.preset,
+                                qc_flags=split_list(args.qc_flags))
 
     if args.info:
-        info = converter.get_nc_file_info(args.input)
-        print(json.dumps(info, indent=2))
+        info = converter.get_nc_file_info(args.input, fast=args.fast)
+        print(json.dumps(info, indent=2, default=str))
+    elif args.catalogue and os.path.isdir(args.input):
+        summary = converter.build_catalogue(args.input, args.catalogue, workers=args.workers)
+        print(json.dumps(summary, indent=2))
     elif os.path.isfile(args.input):
         result = converter.convert_single_file(args.input)
         print(json.dumps(result, indent=2))
     elif os.path.isdir(args.input):
-        results = converter.batch_convert(args.input)
+        results = converter.batch_convert(args.input, workers=args.workers,
+                                          incremental=args.incremental)
         print(json.dumps(results, indent=2))
     else:
         print(f"Error: {args.input} is not a valid file or directory")
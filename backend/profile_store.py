@@ -0,0 +1,273 @@
+import io
+import os
+import numpy as np
+import pandas as pd
+from nc_converter import ADJUSTED_DATA_MODES
+
+# Level variables of a stored profile, with the legacy ocean_profiles column of each
+PROFILE_VARIABLES = {
+    'PRES': 'pressure',
+    'TEMP': 'temperature',
+    'PSAL': 'salinity',
+    'DOXY': 'oxygen',
+    'DEPTH': 'depth'
+}
+
+# Variables that have a QC flag array, named <variable>_QC
+QC_VARIABLES = ('PRES', 'TEMP', 'PSAL', 'DOXY')
+
+# Files read_levels can load: ARGO NetCDF and the NetCDFConverter output formats
+INGEST_EXTENSIONS = ('.nc', '.csv', '.parquet', '.feather')
+
+# Per-profile ARGO variables read on ingest, besides the level variables
+PROFILE_COLUMNS = ('PLATFORM_NUMBER', 'JULD', 'LATITUDE', 'LONGITUDE', 'DATA_MODE')
+
+def pack_profile(levels):
+    """Serialize the level arrays of one profile into a compressed npz blob
+
+    ``levels`` maps variable names (PRES, TEMP, ...) to values, and
+    ``<variable>_QC`` names to one-character QC flags. Values are stored
+    as float32 with NaN for missing data and flags as single bytes, so a
+    level costs a few bytes per variable instead of a table row. Levels
+    are sorted by pressure when PRES is given.
+    """
+    arrays = {}
+    for name, values in levels.items():
+        if values is None:
+            continue
+        if name.endswith('_QC'):
+            if isinstance(values, np.ndarray) and values.dtype.kind == 'S':
+                arrays[name] = values.astype('S1')
+            else:
+                arrays[name] = np.array([(flag or ' ')[:1] for flag in values], dtype='S1')
+        else:
+            arrays[name] = np.asarray(values, dtype=np.float32)
+
+    sizes = {len(values) for values in arrays.values()}
+    if len(sizes) > 1:
+        raise ValueError(f"Level arrays of a profile must have the same length, got {sorted(sizes)}")
+
+    if 'PRES' in arrays:
+        order = np.argsort(arrays['PRES'], kind='stable')
+        arrays = {name: values[order] for name, values in arrays.items()}
+
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **arrays)
+    return buffer.getvalue()
+
+def unpack_profile(blob):
+    """Level arrays of a blob written by ``pack_profile``"""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+def profile_levels_json(arrays):
+    """JSON-ready level arrays: legacy column names, null for missing values"""
+    levels = {}
+    for variable, column in PROFILE_VARIABLES.items():
+        if variable in arrays:
+            values = np.round(arrays[variable].astype(np.float64), 4)
+            levels[column] = [None if np.isnan(value) else value for value in values.tolist()]
+
+    qc = {}
+    for variable in QC_VARIABLES:
+        name = f"{variable}_QC"
+        if name in arrays:
+            qc[variable] = arrays[name].tobytes().decode('ascii')
+    if qc:
+        levels['qc'] = qc
+    return levels
+
+def group_level_rows(rows):
+    """Profiles from legacy level rows sorted by (float_id, profile_date)
+
+    ``rows`` are (float_id, profile_date, latitude, longitude, depth,
+    temperature, salinity, pressure, oxygen, quality_flag) tuples. Yields
+    (float_id, profile_date, latitude, longitude, levels) with ``levels``
+    ready for ``pack_profile``; the row's single quality flag becomes the
+    QC flag of every variable of its level.
+    """
+    current = None
+    columns = None
+    for float_id, profile_date, latitude, longitude, *values, quality_flag in rows:
+        key = (float_id, profile_date)
+        if key != current:
+            if current is not None:
+                yield current + position + (_level_arrays(columns),)
+            current = key
+            position = (latitude, longitude)
+            columns = []
+        columns.append(values + [quality_flag])
+
+    if current is not None:
+        yield current + position + (_level_arrays(columns),)
+
+def _level_arrays(columns):
+    depth, temperature, salinity, pressure, oxygen, flags = zip(*columns)
+    levels = {}
+    for variable, values in (('PRES', pressure), ('TEMP', temperature), ('PSAL', salinity),
+                             ('DOXY', oxygen), ('DEPTH', depth)):
+        if any(value is not None for value in values):
+            levels[variable] = [np.nan if value is None else float(value) for value in values]
+    # Legacy flags are words such as 'GOOD'; ARGO digits are kept, GOOD becomes 1 (good)
+    # and anything else 0 (no QC performed)
+    flags = [flag[:1] if flag and flag[:1].isdigit() else ('1' if flag in (None, 'GOOD') else '0')
+             for flag in flags]
+    for variable in QC_VARIABLES:
+        if variable in levels:
+            levels[f"{variable}_QC"] = flags
+    return levels
+
+def _text(values):
+    """Stripped strings of ARGO char, text or numeric values; missing values become ''
+
+    Only the distinct values are decoded in Python.
+    """
+    values = np.asarray(values)
+    codes, uniques = pd.factorize(values.ravel())
+    decoded = [u.decode('utf-8', 'replace').strip() if isinstance(u, bytes) else str(u).strip()
+               for u in uniques]
+    lookup = np.array(decoded + [''], dtype=object)
+    return lookup[codes].reshape(values.shape)
+
+def _flags(values):
+    """One-byte QC flags; a missing flag is a blank"""
+    values = np.asarray(values)
+    codes, uniques = pd.factorize(values.ravel())
+    flags = []
+    for u in uniques:
+        flag = u.decode('ascii', 'replace').strip() if isinstance(u, bytes) else str(u).strip()
+        flags.append((flag[:1] or ' ').encode('ascii', 'replace'))
+    lookup = np.array(flags + [b' '], dtype='S1')
+    return lookup[codes]
+
+def _numbers(values):
+    return pd.to_numeric(pd.Series(np.asarray(values).ravel()), errors='coerce').to_numpy(dtype=np.float64)
+
+def level_table(columns):
+    """Level table of the ARGO variables in ``columns`` (name -> 1-D array, one entry per level)
+
+    Follows the ARGO convention of using the adjusted values and adjusted
+    QC flags of profiles in adjusted or delayed mode (DATA_MODE A or D).
+    Levels without pressure, float or date are dropped. Returns a dict of
+    arrays: float_id, profile_date (datetime64[s]), latitude, longitude and
+    the measured PROFILE_VARIABLES with their QC flags.
+    """
+    missing = [name for name in ('PLATFORM_NUMBER', 'JULD') if name not in columns]
+    if 'PRES' not in columns and 'PRES_ADJUSTED' not in columns:
+        missing.append('PRES')
+    if missing:
+        raise ValueError(f"Profile data is missing {', '.join(missing)}")
+
+    size = len(columns['PLATFORM_NUMBER'])
+    if 'DATA_MODE' in columns:
+        adjusted = np.isin(_text(columns['DATA_MODE']), ADJUSTED_DATA_MODES)
+    else:
+        adjusted = np.zeros(size, dtype=bool)
+
+    table = {
+        'float_id': _text(columns['PLATFORM_NUMBER']).astype('U'),
+        'profile_date': pd.to_datetime(pd.Series(np.asarray(columns['JULD']).ravel()),
+                                       errors='coerce').to_numpy().astype('datetime64[s]'),
+        'latitude': _numbers(columns['LATITUDE']) if 'LATITUDE' in columns else np.full(size, np.nan),
+        'longitude': _numbers(columns['LONGITUDE']) if 'LONGITUDE' in columns else np.full(size, np.nan)
+    }
+
+    for variable in QC_VARIABLES:
+        raw_name, adjusted_name = variable, f"{variable}_ADJUSTED"
+        if raw_name not in columns and adjusted_name not in columns:
+            continue
+        raw = _numbers(columns[raw_name]) if raw_name in columns else np.full(size, np.nan)
+        raw_flags = _flags(columns[f"{raw_name}_QC"]) if f"{raw_name}_QC" in columns else np.full(size, b' ', dtype='S1')
+        if adjusted_name in columns:
+            table[variable] = np.where(adjusted, _numbers(columns[adjusted_name]), raw)
+            if f"{adjusted_name}_QC" in columns:
+                raw_flags = np.where(adjusted, _flags(columns[f"{adjusted_name}_QC"]), raw_flags)
+        else:
+            table[variable] = raw
+        table[f"{variable}_QC"] = raw_flags
+
+    keep = (~np.isnan(table['PRES']) & (table['float_id'] != '')
+            & ~np.isnat(table['profile_date']))
+    return {name: values[keep] for name, values in table.items()}
+
+def dataset_levels(ds):
+    """Level table of an ARGO profile dataset (N_PROF x N_LEVELS)
+
+    Works on the raw arrays, without exploding the dataset into a
+    DataFrame; per-profile variables are repeated for each level.
+    """
+    if 'N_PROF' not in ds.sizes or 'N_LEVELS' not in ds.sizes:
+        raise ValueError('Not an ARGO profile file: N_PROF and N_LEVELS dimensions required')
+    levels = ds.sizes['N_LEVELS']
+
+    columns = {}
+    for name in PROFILE_COLUMNS:
+        if name in ds.variables and ds[name].dims == ('N_PROF',):
+            columns[name] = np.repeat(np.asarray(ds[name].values), levels)
+    for variable in QC_VARIABLES:
+        for name in (variable, f"{variable}_QC", f"{variable}_ADJUSTED", f"{variable}_ADJUSTED_QC"):
+            if name in ds.variables and set(ds[name].dims) == {'N_PROF', 'N_LEVELS'}:
+                columns[name] = np.asarray(ds[name].transpose('N_PROF', 'N_LEVELS').values).ravel()
+    return level_table(columns)
+
+def read_levels(path):
+    """Level table of an ARGO NetCDF file or of NetCDFConverter output (CSV, Parquet, Feather)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.nc':
+        import xarray as xr
+        with xr.open_dataset(path) as ds:
+            return dataset_levels(ds)
+
+    if extension == '.csv':
+        # Identifiers and flags are read as text so they are not turned into numbers
+        header = pd.read_csv(path, nrows=0).columns
+        text = {name: str for name in header if name in ('PLATFORM_NUMBER', 'DATA_MODE') or name.endswith('_QC')}
+        df = pd.read_csv(path, dtype=text)
+    elif extension == '.parquet':
+        df = pd.read_parquet(path)
+    elif extension == '.feather':
+        df = pd.read_feather(path)
+    else:
+        raise ValueError(f"Cannot ingest {extension or 'extensionless'} files")
+    return level_table({name: df[name].to_numpy() for name in df.columns})
+
+def group_levels(table):
+    """Profiles of a level table, as (float_id, profile_date, latitude, longitude, levels)
+
+    Levels are grouped by (float_id, profile_date) and sorted by pressure.
+    A pressure that occurs twice in a profile keeps its last level, so
+    loading the same data twice gives the same profiles. Variables with no
+    value in a profile are left out of it.
+    """
+    count = len(table['PRES'])
+    if not count:
+        return
+    order = np.lexsort((np.arange(count), table['PRES'], table['profile_date'], table['float_id']))
+    table = {name: values[order] for name, values in table.items()}
+
+    float_ids, dates, pressures = table['float_id'], table['profile_date'], table['PRES']
+    new_profile = np.ones(count, dtype=bool)
+    new_profile[1:] = (float_ids[1:] != float_ids[:-1]) | (dates[1:] != dates[:-1])
+
+    keep = np.ones(count, dtype=bool)
+    keep[:-1] = new_profile[1:] | (pressures[1:] != pressures[:-1])
+    starts = np.flatnonzero(new_profile)
+    ends = np.append(starts[1:], count)
+
+    variables = [name for name in QC_VARIABLES if name in table]
+    for start, end in zip(starts, ends):
+        rows = np.arange(start, end)[keep[start:end]]
+        latitudes, longitudes = table['latitude'][rows], table['longitude'][rows]
+        located = np.flatnonzero(~np.isnan(latitudes) & ~np.isnan(longitudes))
+
+        levels = {}
+        for variable in variables:
+            values = table[variable][rows]
+            if variable == 'PRES' or not np.isnan(values).all():
+                levels[variable] = values
+                levels[f"{variable}_QC"] = table[f"{variable}_QC"][rows]
+
+        yield (float_ids[start], dates[start].item(),
+               float(latitudes[located[0]]) if len(located) else None,
+               float(longitudes[located[0]]) if len(located) else None,
+               levels)
@@ -0,0 +1,86 @@
+import time
+import hashlib
+import threading
+from functools import wraps
+from flask import request, make_response
+from pymongo import ReturnDocument
+from vector_db import LRUCache
+
+class ResponseCache:
+    """Cache of GET responses keyed by a data version, with ETags
+
+    Each namespace (``floats``, ``profiles``) has a version counter in a
+    MongoDB collection, so a write in any web worker invalidates the
+    responses cached by all of them. The ETag of a response is derived
+    from its namespace version and URL, which lets a matching
+    ``If-None-Match`` be answered with ``304 Not Modified`` before the
+    view runs. Other requests are served from an in-memory LRU of
+    response bodies until the version changes.
+
+    Versions are re-read at most every ``check_interval`` seconds; writes
+    made by this worker are visible at once.
+    """
+
+    def __init__(self, collection, maxsize=256, check_interval=1.0):
+        self.collection = collection
+        self.check_interval = check_interval
+        self.responses = LRUCache(maxsize)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def version(self, namespace):
+        """Current version of ``namespace``"""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(namespace)
+            if cached is not None and now - cached[1] < self.check_interval:
+                return cached[0]
+
+        doc = self.collection.find_one({'_id': namespace}, {'version': 1})
+        version = doc['version'] if doc else 0
+        with self._lock:
+            self._versions[namespace] = (version, now)
+        return version
+
+    def invalidate(self, *namespaces):
+        """Bump the version of each namespace, expiring its cached responses"""
+        for namespace in namespaces:
+            doc = self.collection.find_one_and_update(
+                {'_id': namespace}, {'$inc': {'version': 1}},
+                upsert=True, return_document=ReturnDocument.AFTER)
+            with self._lock:
+                self._versions[namespace] = (doc['version'], time.monotonic())
+
+    def etag(self, namespace, version, path):
+        digest = hashlib.sha1(path.encode('utf-8')).hexdigest()[:16]
+        return f"{namespace}-{version}-{digest}"
+
+    def cached(self, namespace):
+        """Decorator for GET views whose output only depends on the URL and ``namespace``"""
+        def decorator(f):
+            @wraps(f)
+            def decorated(*args, **kwargs):
+                version = self.version(namespace)
+                etag = self.etag(namespace, version, request.full_path)
+                if etag in request.if_none_match:
+                    response = make_response('', 304)
+                else:
+                    key = (namespace, version, request.full_path)
+                    stored = self.responses.get(key)
+                    if stored is None:
+                        response = make_response(f(*args, **kwargs))
+                        if response.status_code != 200:
+                            return response
+                        headers = [(name, value) for name, value in response.headers
+                                   if name.lower() != 'content-length']
+                        self.responses.put(key, (response.get_data(), headers))
+                    else:
+                        data, headers = stored
+                        response = make_response(data, 200, headers)
+
+                response.set_etag(etag)
+                # Browsers keep the response but revalidate it on every use
+                response.headers['Cache-Control'] = 'private, no-cache'
+                return response
+            return decorated
+        return decorator
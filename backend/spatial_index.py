@@ -0,0 +1,127 @@
+import math
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+def normalize_longitude(longitude):
+    """Longitude(s) wrapped into [-180, 180)"""
+    return (np.asarray(longitude, dtype=np.float64) + 180.0) % 360.0 - 180.0
+
+def parse_bbox(value):
+    """(min_lon, min_lat, max_lon, max_lat) from a "min_lon,min_lat,max_lon,max_lat" string
+
+    A box whose min_lon is greater than its max_lon crosses the
+    antimeridian. Raises ValueError for malformed boxes.
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = [float(item) for item in value.split(',')]
+    except ValueError:
+        raise ValueError('bbox must be min_lon,min_lat,max_lon,max_lat')
+    if not -90 <= min_lat <= max_lat <= 90:
+        raise ValueError('bbox latitudes must satisfy -90 <= min_lat <= max_lat <= 90')
+    if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise ValueError('bbox longitudes must be between -180 and 180')
+    return min_lon, min_lat, max_lon, max_lat
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distances in km from one point to arrays of points"""
+    lat1, lon1 = math.radians(latitude), math.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+class GridIndex:
+    """Static grid of lat/lon points for bounding-box and radius queries
+
+    Points are bucketed into ``cell_size`` degree cells and sorted by cell
+    number (row-major, from the south-west corner). The cells of one grid
+    row that a query covers are then a single contiguous run of the
+    sorted arrays, found with a binary search. Only the points of those
+    runs are compared with the query, so a query costs a few
+    ``searchsorted`` calls plus the points near its area, however many
+    points are indexed.
+
+    Queries return positions in the arrays the index was built from. The
+    index is immutable; build a new one when the points change.
+    """
+
+    def __init__(self, latitudes, longitudes, cell_size=1.0):
+        self.cell_size = float(cell_size)
+        self.rows = int(math.ceil(180.0 / self.cell_size))
+        self.columns = int(math.ceil(360.0 / self.cell_size))
+
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = normalize_longitude(longitudes)
+        cells = self._row(latitudes) * self.columns + self._column(longitudes)
+
+        self.order = np.argsort(cells, kind='stable')
+        self.cells = cells[self.order]
+        self.latitudes = latitudes[self.order]
+        self.longitudes = longitudes[self.order]
+
+    def __len__(self):
+        return len(self.order)
+
+    def _row(self, latitude):
+        return np.clip(((np.asarray(latitude) + 90.0) // self.cell_size).astype(np.int64), 0, self.rows - 1)
+
+    def _column(self, longitude):
+        return np.clip(((np.asarray(longitude) + 180.0) // self.cell_size).astype(np.int64), 0, self.columns - 1)
+
+    def _candidates(self, min_lon, min_lat, max_lon, max_lat):
+        """Sorted positions of the points in the cells covering a box"""
+        if min_lon <= max_lon:
+            lon_ranges = [(min_lon, max_lon)]
+        else:
+            lon_ranges = [(min_lon, 180.0), (-180.0, max_lon)]
+
+        rows = np.arange(self._row(min_lat), self._row(max_lat) + 1)
+        starts, ends = [], []
+        for west, east in lon_ranges:
+            starts.append(rows * self.columns + self._column(west))
+            ends.append(rows * self.columns + self._column(east))
+        starts = np.searchsorted(self.cells, np.concatenate(starts), side='left')
+        ends = np.searchsorted(self.cells, np.concatenate(ends), side='right')
+
+        runs = [np.arange(start, end) for start, end in zip(starts, ends) if end > start]
+        return np.concatenate(runs) if runs else np.zeros(0, dtype=np.int64)
+
+    def bbox(self, min_lon, min_lat, max_lon, max_lat):
+        """Positions of the points inside a box; min_lon > max_lon crosses the antimeridian"""
+        candidates = self._candidates(min_lon, min_lat, max_lon, max_lat)
+
+        latitudes = self.latitudes[candidates]
+        longitudes = self.longitudes[candidates]
+        inside = (latitudes >= min_lat) & (latitudes <= max_lat)
+        if min_lon <= max_lon:
+            inside &= (longitudes >= min_lon) & (longitudes <= max_lon)
+        else:
+            inside &= (longitudes >= min_lon) | (longitudes <= max_lon)
+        return self.order[candidates[inside]]
+
+    def radius(self, latitude, longitude, radius_km):
+        """(positions, distances in km) of the points within ``radius_km``, nearest first"""
+        angle = radius_km / EARTH_RADIUS_KM
+        min_lat = latitude - math.degrees(angle)
+        max_lat = latitude + math.degrees(angle)
+
+        if min_lat <= -90 or max_lat >= 90 or angle >= math.pi / 2:
+            # The circle reaches a pole, so it spans every longitude
+            min_lon, max_lon = -180.0, 180.0
+        else:
+            spread = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(latitude)))))
+            min_lon, max_lon = longitude - spread, longitude + spread
+            if max_lon - min_lon >= 360:
+                min_lon, max_lon = -180.0, 180.0
+            else:
+                min_lon, max_lon = [float(value) for value in normalize_longitude([min_lon, max_lon])]
+        min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+
+        candidates = self._candidates(min_lon, min_lat, max_lon, max_lat)
+        distances = haversine_km(latitude, longitude, self.latitudes[candidates], self.longitudes[candidates])
+        within = distances <= radius_km
+        candidates, distances = candidates[within], distances[within]
+
+        nearest = np.argsort(distances, kind='stable')
+        return self.order[candidates[nearest]], distances[nearest]
@@ -0,0 +1,158 @@
+import os
+import re
+import fcntl
+import json
+import time
+import uuid
+from datetime import datetime
+
+# Size of the blocks copied from the request stream to disk
+COPY_BLOCK_SIZE = 1024 * 1024
+
+UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+class UploadError(Exception):
+    """Raised for invalid upload requests; ``status`` is the HTTP status to return"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+class ChunkedUploadStore:
+    """Resumable uploads that are spooled straight to disk
+
+    An upload is a ``<id>.part`` data file plus a ``<id>.json`` descriptor
+    in ``folder``. Chunks are appended at an explicit offset and the
+    current offset is simply the size of the part file, so an interrupted
+    client can ask where to resume and any web worker can take the next
+    chunk. Request bodies are copied in small blocks and never held in
+    memory whole. Writers hold an exclusive ``flock`` on the part file, so
+    concurrent requests for one upload, in any worker, cannot interleave.
+    """
+
+    def __init__(self, folder, max_upload_size, expire_after=24 * 3600):
+        self.folder = folder
+        self.max_upload_size = max_upload_size
+        self.expire_after = expire_after
+        os.makedirs(self.folder, exist_ok=True)
+
+    def _paths(self, upload_id):
+        if not upload_id or not UPLOAD_ID_PATTERN.match(upload_id):
+            raise UploadError('Upload not found', 404)
+        base = os.path.join(self.folder, upload_id)
+        return f"{base}.part", f"{base}.json"
+
+    def create(self, user_id, filename, total_size=None):
+        """Start a new upload and return its descriptor"""
+        if total_size is not None:
+            total_size = int(total_size)
+            if total_size < 0 or total_size > self.max_upload_size:
+                raise UploadError(f'Upload size must be between 0 and {self.max_upload_size} bytes', 413)
+
+        self.purge_expired()
+
+        upload_id = uuid.uuid4().hex
+        part_path, meta_path = self._paths(upload_id)
+        meta = {
+            'upload_id': upload_id,
+            'user_id': user_id,
+            'filename': filename,
+            'size': total_size,
+            'created_at': datetime.utcnow().isoformat()
+        }
+
+        open(part_path, 'wb').close()
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+
+        return dict(meta, offset=0)
+
+    def get(self, upload_id):
+        """Descriptor of an upload, with the number of bytes received so far"""
+        part_path, meta_path = self._paths(upload_id)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            offset = os.path.getsize(part_path)
+        except FileNotFoundError:
+            raise UploadError('Upload not found', 404)
+
+        return dict(meta, offset=offset)
+
+    def append(self, upload_id, stream, offset):
+        """Append the contents of ``stream`` at ``offset``; returns the new offset
+
+        ``offset`` must equal the bytes received so far, which protects
+        against duplicated or out-of-order chunks after a retry. A chunk
+        arriving while another one is being written is refused with 409.
+        """
+        upload = self.get(upload_id)
+        limit = upload['size'] if upload['size'] is not None else self.max_upload_size
+        part_path, _ = self._paths(upload_id)
+
+        with self._locked(part_path) as f:
+            # The offset is read under the lock; the descriptor's may be stale
+            start = os.fstat(f.fileno()).st_size
+            if offset != start:
+                raise UploadError(f"Offset mismatch: upload is at byte {start}", 409)
+
+            written = start
+            f.seek(start)
+            while True:
+                block = stream.read(COPY_BLOCK_SIZE)
+                if not block:
+                    break
+                written += len(block)
+                if written > limit:
+                    f.truncate(start)
+                    raise UploadError(f'Upload exceeds its size of {limit} bytes', 413)
+                f.write(block)
+
+        return written
+
+    def _locked(self, part_path):
+        """The part file opened for writing with an exclusive lock; 409 if it is held"""
+        try:
+            f = open(part_path, 'r+b')
+        except FileNotFoundError:
+            raise UploadError('Upload not found', 404)
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            f.close()
+            raise UploadError('Another chunk of this upload is being written', 409)
+        return f
+
+    def complete(self, upload_id, destination):
+        """Move a finished upload to ``destination`` and forget it"""
+        upload = self.get(upload_id)
+        if upload['size'] is not None and upload['offset'] != upload['size']:
+            raise UploadError(
+                f"Upload incomplete: received {upload['offset']} of {upload['size']} bytes", 409)
+
+        part_path, meta_path = self._paths(upload_id)
+        with self._locked(part_path) as f:
+            if upload['size'] is not None and os.fstat(f.fileno()).st_size != upload['size']:
+                raise UploadError('Upload changed while completing it', 409)
+            os.replace(part_path, destination)
+        os.remove(meta_path)
+        return upload
+
+    def discard(self, upload_id):
+        """Delete an upload and everything received for it"""
+        for path in self._paths(upload_id):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def purge_expired(self):
+        """Remove uploads that have not received data for ``expire_after`` seconds"""
+        cutoff = time.time() - self.expire_after
+        for name in os.listdir(self.folder):
+            upload_id, extension = os.path.splitext(name)
+            if extension != '.part' or not UPLOAD_ID_PATTERN.match(upload_id):
+                continue
+            try:
+                if os.path.getmtime(os.path.join(self.folder, name)) < cutoff:
+                    self.discard(upload_id)
+            except FileNotFoundError:
+                pass
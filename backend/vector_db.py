@@ -1,52 +1,575 @@
 import numpy as np
 import faiss
-from sentence_transformers import SentenceTransformer
 import json
 import os
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 from pymongo import MongoClient
 
+class LRUCache:
+    """Small thread-safe least-recently-used cache
+
+    With ``ttl`` (seconds), entries older than that count as missing.
+    Hits and misses are counted for ``stats``.
+    """
+
+    def __init__(self, maxsize=10000, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] is not None and entry[1] < time.monotonic():
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+INDEX_TYPES = ('flat', 'ivf_flat', 'ivf_pq', 'hnsw', 'fp16', 'sq8', 'pq', 'ivf_sq8')
+
+# Types that learn from the data before vectors can be added
+TRAINED_INDEX_TYPES = ('ivf_flat', 'ivf_pq', 'sq8', 'pq', 'ivf_sq8')
+
+# FAISS k-means warns below this many training points per centroid
+MIN_POINTS_PER_CENTROID = 39
+
+def index_factory_string(index_type, nlist=1024, pq_m=16, pq_nbits=8, hnsw_m=32):
+    """faiss.index_factory description of one of INDEX_TYPES
+
+    Besides the search structures, the types select how vectors are
+    stored: float32 (flat, ivf_flat, hnsw), float16 (fp16, half the
+    memory), 8-bit scalar quantization (sq8, ivf_sq8, a quarter) and
+    product quantization (pq, ivf_pq, ``pq_m * pq_nbits / 8`` bytes).
+    """
+    if index_type == 'flat':
+        return 'Flat'
+    if index_type == 'ivf_flat':
+        return f'IVF{nlist},Flat'
+    if index_type == 'ivf_pq':
+        return f'IVF{nlist},PQ{pq_m}x{pq_nbits}'
+    if index_type == 'hnsw':
+        return f'HNSW{hnsw_m}'
+    if index_type == 'fp16':
+        return 'SQfp16'
+    if index_type == 'sq8':
+        return 'SQ8'
+    if index_type == 'pq':
+        return f'PQ{pq_m}x{pq_nbits}'
+    if index_type == 'ivf_sq8':
+        return f'IVF{nlist},SQ8'
+    raise ValueError(f"Unknown index type '{index_type}'. Expected one of: {', '.join(INDEX_TYPES)}")
+
+def vector_id(doc_id):
+    """Stable 63-bit FAISS id for a document id"""
+    digest = hashlib.blake2b(str(doc_id).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') & 0x7FFFFFFFFFFFFFFF
+
+def empty_index(dimension):
+    """An empty exact index addressed by vector ids"""
+    return faiss.IndexIDMap2(faiss.IndexFlatL2(dimension))
+
+def base_index(index):
+    """The index that stores the vectors, unwrapped from an IndexIDMap"""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIDMap):
+        index = faiss.downcast_index(index.index)
+    return index
+
+def enable_id_lookup(index):
+    """Let an IVF index reconstruct and remove vectors by id
+
+    IVF indexes keep the ids in their inverted lists, so they are not
+    wrapped in an IndexIDMap: the wrapper assumes removals keep the
+    remaining vectors in order, which IVF removal does not. A hashtable
+    direct map finds vectors by arbitrary ids instead. Returns ``index``.
+    """
+    ivf = faiss.downcast_index(index)
+    if isinstance(ivf, faiss.IndexIVF) and ivf.direct_map.type != faiss.DirectMap.Hashtable:
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+    return index
+
+def index_ids(index):
+    """Vector ids of an index, in storage order"""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIDMap):
+        return faiss.vector_to_array(index.id_map)
+    if isinstance(index, faiss.IndexIVF):
+        invlists = index.invlists
+        lists = [faiss.rev_swig_ptr(invlists.get_ids(list_no), invlists.list_size(list_no)).copy()
+                 for list_no in range(invlists.nlist) if invlists.list_size(list_no)]
+        return np.concatenate(lists).astype(np.int64) if lists else np.zeros(0, dtype=np.int64)
+    return np.arange(index.ntotal, dtype=np.int64)
+
+def index_vectors(index):
+    """Vectors of an index, aligned with ``index_ids``
+
+    Quantized indexes return their decoded, approximate vectors.
+    """
+    if isinstance(faiss.downcast_index(index), faiss.IndexIVF):
+        ids = index_ids(index)
+        if not len(ids):
+            return np.zeros((0, index.d), dtype=np.float32)
+        return enable_id_lookup(index).reconstruct_batch(ids)
+    return base_index(index).reconstruct_n(0, index.ntotal)
+
+def index_memory_bytes(index):
+    """Approximate memory held by an index's vectors, ids and search structure"""
+    index = faiss.downcast_index(index)
+    total = 0
+    if isinstance(index, faiss.IndexIDMap):
+        # id_map, plus the reverse map of IndexIDMap2
+        total += index.ntotal * (8 if type(index) is faiss.IndexIDMap else 32)
+        index = faiss.downcast_index(index.index)
+    if isinstance(index, faiss.IndexHNSW):
+        total += index.hnsw.neighbors.size() * 4 + index.hnsw.levels.size() * 4
+        index = faiss.downcast_index(index.storage)
+    if isinstance(index, faiss.IndexIVF):
+        # ids in the inverted lists, centroids and the id hashtable
+        total += index.ntotal * 8 + index.nlist * index.d * 4
+        if index.direct_map.type == faiss.DirectMap.Hashtable:
+            total += index.ntotal * 32
+    return total + index.ntotal * index.code_size
+
+def build_index(vectors, dimension, index_type='flat', nlist=1024, pq_m=16, pq_nbits=8, hnsw_m=32,
+                ids=None):
+    """Create an index of ``index_type`` holding ``vectors``, in order
+
+    IVF variants are trained on ``vectors`` first. ``nlist`` is reduced to
+    what the data can support and the PQ code size to at most log2 of the
+    number of vectors, so small collections still produce a usable index.
+    With ``ids`` the vectors are stored under them: IVF indexes take the
+    ids directly, other types are wrapped in an IndexIDMap2.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, dimension)
+    n = len(vectors)
+
+    if index_type in TRAINED_INDEX_TYPES and n == 0:
+        raise ValueError(f"A {index_type} index needs training vectors")
+    if index_type in ('ivf_flat', 'ivf_pq', 'ivf_sq8'):
+        nlist = max(1, min(nlist, n // MIN_POINTS_PER_CENTROID))
+    if index_type in ('ivf_pq', 'pq'):
+        if dimension % pq_m:
+            raise ValueError(f"pq_m ({pq_m}) must divide the dimension ({dimension})")
+        pq_nbits = max(1, min(pq_nbits, int(np.log2(n))))
+
+    index = faiss.index_factory(dimension, index_factory_string(index_type, nlist, pq_m, pq_nbits, hnsw_m))
+    if not index.is_trained:
+        index.train(vectors)
+
+    if ids is not None:
+        if isinstance(faiss.downcast_index(index), faiss.IndexIVF):
+            enable_id_lookup(index)
+        else:
+            index = faiss.IndexIDMap2(index)
+        if n:
+            index.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+    elif n:
+        index.add(vectors)
+    return index
+
+def remove_ids(index, ids):
+    """Remove ``ids`` from an index with vector ids; returns the index to use afterwards
+
+    HNSW graphs cannot drop vectors, so an HNSW index is rebuilt without
+    them instead; the returned index is then a new object.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    try:
+        index.remove_ids(ids)
+        return index
+    except RuntimeError:
+        if index_type_of(index) != 'hnsw':
+            raise
+
+    hnsw = base_index(index).hnsw
+    current_ids = index_ids(index)
+    keep = ~np.isin(current_ids, ids)
+    rebuilt = build_index(index_vectors(index)[keep], index.d, 'hnsw',
+                          hnsw_m=hnsw.nb_neighbors(1), ids=current_ids[keep])
+    set_search_params(rebuilt, ef_search=hnsw.efSearch)
+    return rebuilt
+
+def index_type_of(index):
+    """Which of INDEX_TYPES ``index`` is, or None for other index types"""
+    index = base_index(index)
+    if isinstance(index, faiss.IndexFlat):
+        return 'flat'
+    if isinstance(index, faiss.IndexHNSW):
+        return 'hnsw'
+    if isinstance(index, faiss.IndexIVFPQ):
+        return 'ivf_pq'
+    if isinstance(index, faiss.IndexIVFFlat):
+        return 'ivf_flat'
+    if isinstance(index, faiss.IndexIVFScalarQuantizer) and index.sq.qtype == faiss.ScalarQuantizer.QT_8bit:
+        return 'ivf_sq8'
+    if isinstance(index, faiss.IndexPQ):
+        return 'pq'
+    if isinstance(index, faiss.IndexScalarQuantizer):
+        if index.sq.qtype == faiss.ScalarQuantizer.QT_fp16:
+            return 'fp16'
+        if index.sq.qtype == faiss.ScalarQuantizer.QT_8bit:
+            return 'sq8'
+    return None
+
+# Metadata fields that searches can be restricted to
+FILTER_FIELDS = ('type', 'category', 'region', 'float_id', 'topic', 'parameter')
+
+def validate_filters(filters):
+    """Check a metadata filter dict; values are a single value or a list of values"""
+    if not isinstance(filters, dict):
+        raise ValueError('filters must be an object')
+    for field, value in filters.items():
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Cannot filter on '{field}'. Expected one of: {', '.join(FILTER_FIELDS)}")
+        values = value if isinstance(value, list) else [value]
+        if not values or not all(isinstance(v, (str, int)) and not isinstance(v, bool) for v in values):
+            raise ValueError(f"Filter '{field}' must be a string, a number or a list of them")
+    return filters
+
+def matches_filters(metadata, filters):
+    """Whether a metadata dict passes ``filters``"""
+    for field, value in filters.items():
+        values = value if isinstance(value, list) else [value]
+        if metadata.get(field) not in values:
+            return False
+    return True
+
+def search_subset(index, query_vectors, k, ids):
+    """Search only among vector ``ids``; returns (distances, labels) like Index.search
+
+    ``ids`` must be stored in the index. The search is given a FAISS ID
+    selector, so other vectors are skipped and a selective filter still
+    yields ``k`` results. IVF probes and HNSW walks can run out of
+    matching vectors; such queries are repeated once over all IVF lists,
+    or with an HNSW candidate list large enough to meet ``k`` matches.
+    Missing results are labelled -1.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    query_vectors = np.ascontiguousarray(query_vectors, dtype=np.float32)
+    k = min(k, len(ids))
+    if k == 0:
+        return (np.zeros((len(query_vectors), 0), dtype=np.float32),
+                np.zeros((len(query_vectors), 0), dtype=np.int64))
+
+    base = base_index(index)
+    if isinstance(base, faiss.IndexPQ):
+        return _search_pq_subset(index, base, query_vectors, k, ids)
+
+    selector = faiss.IDSelectorBatch(ids)
+    wider = None
+    if isinstance(base, faiss.IndexIVF):
+        params = faiss.SearchParametersIVF(sel=selector, nprobe=base.nprobe)
+        if base.nprobe < base.nlist:
+            wider = faiss.SearchParametersIVF(sel=selector, nprobe=base.nlist)
+    elif isinstance(base, faiss.IndexHNSW):
+        ef_search = base.hnsw.efSearch
+        params = faiss.SearchParametersHNSW(sel=selector, efSearch=ef_search)
+        # About ntotal / len(ids) nodes are visited per match
+        needed = min(index.ntotal, 4 * k * index.ntotal // len(ids))
+        if needed > ef_search:
+            wider = faiss.SearchParametersHNSW(sel=selector, efSearch=needed)
+    else:
+        params = faiss.SearchParameters(sel=selector)
+
+    distances, labels = index.search(query_vectors, k, params=params)
+    if wider is not None and (labels == -1).any():
+        distances, labels = index.search(query_vectors, k, params=wider)
+    return distances, labels
+
+def _search_pq_subset(index, base, query_vectors, k, ids):
+    """search_subset for IndexPQ, whose search takes no selector
+
+    Scores the stored codes of ``ids`` against per-query distance tables,
+    the same asymmetric distances IndexPQ.search computes.
+    """
+    if isinstance(faiss.downcast_index(index), faiss.IndexIDMap):
+        stored = faiss.rev_swig_ptr(index.id_map.data(), index.id_map.size())
+        positions = np.flatnonzero(np.isin(stored, ids))
+        labels = stored[positions]
+    else:
+        positions = labels = ids
+
+    pq = base.pq
+    codes = faiss.rev_swig_ptr(base.codes.data(), base.codes.size()).reshape(base.ntotal, base.code_size)
+    codes = codes[positions]
+    if pq.nbits == 8:
+        codes = codes.astype(np.int64)
+    else:
+        codes = faiss.unpack_bitstrings(codes, pq.M, pq.nbits).astype(np.int64)
+
+    tables = np.empty((len(query_vectors), pq.M, pq.ksub), dtype=np.float32)
+    pq.compute_distance_tables(len(query_vectors), faiss.swig_ptr(query_vectors), faiss.swig_ptr(tables))
+
+    k = min(k, len(positions))
+    all_distances = np.empty((len(query_vectors), k), dtype=np.float32)
+    all_labels = np.empty((len(query_vectors), k), dtype=np.int64)
+    subquantizers = np.arange(pq.M)
+    for i, table in enumerate(tables):
+        distances = table[subquantizers, codes].sum(axis=1)
+        nearest = np.argpartition(distances, k - 1)[:k] if len(distances) > k else np.arange(len(distances))
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        all_distances[i], all_labels[i] = distances[nearest], labels[nearest]
+    return all_distances, all_labels
+
+def set_search_params(index, nprobe=None, ef_search=None):
+    """Apply search-time parameters that are meaningful for ``index``
+
+    ``nprobe`` is the number of IVF lists scanned per query and
+    ``ef_search`` the HNSW candidate list size; both trade latency for
+    recall. Parameters that do not apply to the index type are ignored.
+    """
+    params = faiss.ParameterSpace()
+    for name, value in (('nprobe', nprobe), ('efSearch', ef_search)):
+        if value is None:
+            continue
+        try:
+            params.set_index_parameter(index, name, value)
+        except RuntimeError:
+            pass
+
+def load_index(path, dimension, mmap=False):
+    """Read a FAISS index written by save_index, or start an empty one
+
+    With ``mmap`` the index data is mapped from the file instead of read
+    into memory, so processes loading the same file share its pages.
+    Such an index is read-only; pass it through ``unmap_index`` before
+    adding to it.
+    """
+    if not os.path.exists(path):
+        return empty_index(dimension)
+
+    flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+    index = faiss.read_index(path, flags)
+    if index.d != dimension:
+        raise ValueError(f"Index {path} has dimension {index.d}, expected {dimension}")
+
+    wrapped = isinstance(faiss.downcast_index(index), faiss.IndexIDMap)
+    if wrapped and isinstance(base_index(index), faiss.IndexIVF):
+        index = unwrap_ivf(index)
+    elif isinstance(base_index(index), faiss.IndexIVF):
+        enable_id_lookup(index)
+    elif not wrapped:
+        # Saved before vectors had ids, when they were addressed by position
+        index = build_index(index.reconstruct_n(0, index.ntotal), dimension,
+                            ids=np.arange(index.ntotal))
+    return index
+
+def unmap_index(index):
+    """Return ``index`` with all its data in memory, so it can be written to
+
+    faiss.clone_index cannot copy the on-disk inverted lists that mapping
+    an IVF index creates. Those are copied list by list into in-memory
+    lists, which replace them in ``index`` itself; the ids and the direct
+    map stay valid. Other types are cloned.
+    """
+    ivf = faiss.downcast_index(index)
+    if not isinstance(ivf, faiss.IndexIVF):
+        return faiss.clone_index(index)
+    if not isinstance(faiss.downcast_InvertedLists(ivf.invlists), faiss.OnDiskInvertedLists):
+        return index
+
+    mapped = ivf.invlists
+    invlists = faiss.ArrayInvertedLists(ivf.nlist, ivf.code_size)
+    for list_no in range(ivf.nlist):
+        size = mapped.list_size(list_no)
+        if size:
+            list_ids, codes = mapped.get_ids(list_no), mapped.get_codes(list_no)
+            invlists.add_entries(list_no, size, list_ids, codes)
+            mapped.release_ids(list_no, list_ids)
+            mapped.release_codes(list_no, codes)
+    ivf.replace_invlists(invlists, True)
+    invlists.this.disown()
+    return index
+
+def unwrap_ivf(index):
+    """Move an IVF index out of an IndexIDMap written by earlier versions
+
+    The trained quantizer is kept and the vectors are added back under
+    their ids. If a removal already misaligned the wrapper's ids, the
+    vectors cannot be matched to their ids any more; the index is then
+    returned empty and sync_vector_index embeds the documents again.
+    """
+    ids = faiss.vector_to_array(faiss.downcast_index(index).id_map)
+    base = faiss.clone_index(unmap_index(base_index(index)))
+    ivf = faiss.downcast_index(base)
+    try:
+        ivf.make_direct_map()
+        vectors = ivf.reconstruct_n(0, ivf.ntotal)
+    except RuntimeError:
+        print(f"Vector index ids are inconsistent; dropping {len(ids)} vectors to be re-embedded")
+        ids, vectors = ids[:0], None
+    ivf.reset()
+    enable_id_lookup(base)
+    if len(ids):
+        base.add_with_ids(vectors, ids)
+    return base
+
+def save_index(index, path):
+    """Write a FAISS index atomically; readers never see a partial file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    faiss.write_index(index, temp_path)
+    os.replace(temp_path, path)
+
 class ArgoVectorDB:
     """Vector database for ARGO domain knowledge and chat responses"""
 
     def __init__(self, model_name='all-MiniLM-L6-v2', dimension=384):
+        # Imported here so the index helpers above can be used without loading torch
+        from sentence_transformers import SentenceTransformer
+
         self.model = SentenceTransformer(model_name)
         self.dimension = dimension
-        self.index = faiss.IndexFlatL2(dimension)
+        self.index = empty_index(dimension)
         self.documents = {}
         self.metadata_store = {}
 
+    def rebuild_index(self, index_type, nprobe=None, ef_search=None, **options):
+        """Move the stored vectors into an index of ``index_type``
+
+        Documents keep their vector ids. ``options`` are passed to
+        ``build_index`` (nlist, pq_m, pq_nbits, hnsw_m). Rebuilding from a
+        quantized index starts from its approximate vectors, so convert
+        from a flat index to keep the full precision.
+        """
+        self.index = build_index(index_vectors(self.index), self.dimension, index_type,
+                                 ids=index_ids(self.index), **options)
+        set_search_params(self.index, nprobe=nprobe, ef_search=ef_search)
+        return self.index
+
+    def memory_usage(self):
+        """Index type and approximate memory footprint of the vectors"""
+        memory = index_memory_bytes(self.index)
+        return {
+            'index_type': index_type_of(self.index),
+            'vectors': self.index.ntotal,
+            'memory_bytes': memory,
+            'bytes_per_vector': round(memory / self.index.ntotal, 1) if self.index.ntotal else None
+        }
+
+    def _upsert(self, documents, embeddings):
+        """Store documents under their vector ids, replacing earlier versions"""
+        ids = np.array([vector_id(doc['id']) for doc in documents], dtype=np.int64)
+        existing = [int(i) for i in ids if int(i) in self.documents]
+        if existing:
+            self.index = remove_ids(self.index, existing)
+        self.index.add_with_ids(np.asarray(embeddings, dtype=np.float32), ids)
+
+        created_at = datetime.utcnow().isoformat()
+        for i, doc in zip(ids, documents):
+            self.documents[int(i)] = {
+                'doc_id': doc['id'],
+                'text': doc['text'],
+                'metadata': doc.get('metadata') or {},
+                'created_at': created_at
+            }
+        return [int(i) for i in ids]
+
     def add_document(self, doc_id, text, metadata=None):
-        """Add a document to the vector database"""
+        """Add a document, or replace the document with the same doc_id"""
         try:
             embedding = self.model.encode([text])
-            self.index.add(embedding.astype(np.float32))
-
-            current_index = self.index.ntotal - 1
-            self.documents[current_index] = {
-                'doc_id': doc_id,
-                'text': text,
-                'metadata': metadata or {},
-                'created_at': datetime.utcnow().isoformat()
-            }
-
-            return current_index
+            return self._upsert([{'id': doc_id, 'text': text, 'metadata': metadata}], embedding)[0]
 
         except Exception as e:
             print(f"Error adding document {doc_id}: {str(e)}")
             return None
 
-    def search_similar(self, query, top_k=5):
-        """Search for similar documents"""
+    def add_documents(self, documents, batch_size=64):
+        """Add or replace many documents at once; returns their vector ids
+
+        ``documents`` are dicts with ``id``, ``text`` and optional
+        ``metadata``. Texts are encoded in batches and added to the index
+        in a single call. When an id repeats, the last document wins.
+        """
+        documents = list({doc['id']: doc for doc in documents}.values())
+        if not documents:
+            return []
+
+        try:
+            embeddings = self.model.encode([doc['text'] for doc in documents], batch_size=batch_size)
+            return self._upsert(documents, embeddings)
+
+        except Exception as e:
+            print(f"Error adding {len(documents)} documents: {str(e)}")
+            return []
+
+    def delete_document(self, doc_id):
+        """Remove a document; returns False if it was not stored"""
+        idx = vector_id(doc_id)
+        if idx not in self.documents:
+            return False
+
+        self.index = remove_ids(self.index, [idx])
+        del self.documents[idx]
+        return True
+
+    def search_similar(self, query, top_k=5, filters=None):
+        """Search for similar documents
+
+        ``filters`` restricts the search to documents whose metadata
+        matches, e.g. ``{'category': 'oceanography'}``.
+        """
         try:
             if self.index.ntotal == 0:
                 return []
 
             query_embedding = self.model.encode([query])
-            distances, indices = self.index.search(
-                query_embedding.astype(np.float32), 
-                min(top_k, self.index.ntotal)
-            )
+            if filters:
+                validate_filters(filters)
+                ids = [idx for idx, doc in self.documents.items() if matches_filters(doc['metadata'], filters)]
+                if not ids:
+                    return []
+                distances, indices = search_subset(self.index, query_embedding, top_k, ids)
+            else:
+                distances, indices = self.index.search(
+                    query_embedding.astype(np.float32), 
+                    min(top_k, self.index.ntotal)
+                )
 
             results = []
             for i, idx in enumerate(indices[0]):
@@ -106,8 +629,7 @@ class ArgoVectorDB:
             }
         ]
 
-        for item in knowledge_base:
-            self.add_document(item['id'], item['text'], item['metadata'])
+        self.add_documents(knowledge_base)
 
         print(f"Initialized vector database with {len(knowledge_base)} knowledge items")
 
@@ -115,7 +637,7 @@ class ArgoVectorDB:
         """Save vector database to file"""
         try:
             # Save FAISS index
-            faiss.write_index(self.index, f"{filepath}.faiss")
+            save_index(self.index, f"{filepath}.faiss")
 
             # Save documents and metadata
             with open(f"{filepath}.json", 'w') as f:
@@ -132,12 +654,12 @@ class ArgoVectorDB:
             print(f"Error saving vector database: {str(e)}")
             return False
 
-    def load_from_file(self, filepath):
-        """Load vector database from file"""
+    def load_from_file(self, filepath, mmap=False):
+        """Load vector database from file; ``mmap`` maps the index read-only"""
         try:
             # Load FAISS index
             if os.path.exists(f"{filepath}.faiss"):
-                self.index = faiss.read_index(f"{filepath}.faiss")
+                self.index = load_index(f"{filepath}.faiss", self.dimension, mmap=mmap)
 
             # Load documents and metadata
             if os.path.exists(f"{filepath}.json"):
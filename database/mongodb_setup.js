@@ -77,6 +77,15 @@ db.createCollection("conversion_logs", {
                     bsonType: ["string", "null"],
                     description: "Generated CSV filename"
                 },
+                output_file: {
+                    bsonType: ["string", "null"],
+                    description: "Generated output filename (any format)"
+                },
+                output_format: {
+                    bsonType: ["string", "null"],
+                    enum: ["csv", "parquet", "feather", null],
+                    description: "Output file format"
+                },
                 status: {
                     bsonType: "string",
                     enum: ["success", "failed", "processing"],
@@ -94,8 +103,12 @@ db.createCollection("vector_metadata", {
             required: ["index", "text", "created_at"],
             properties: {
                 index: {
-                    bsonType: "int",
-                    description: "FAISS vector index position"
+                    bsonType: ["int", "long"],
+                    description: "FAISS vector id"
+                },
+                doc_id: {
+                    bsonType: "string",
+                    description: "Stable document id used to replace or delete the entry"
                 },
                 text: {
                     bsonType: "string",
@@ -110,6 +123,22 @@ db.createCollection("vector_metadata", {
     }
 });
 
+// Data versions behind the ETags of cached API responses, e.g. {_id: "floats", version: 3}
+db.createCollection("cache_versions", {
+    validator: {
+        $jsonSchema: {
+            bsonType: "object",
+            required: ["version"],
+            properties: {
+                version: {
+                    bsonType: ["int", "long"],
+                    description: "Incremented whenever the namespace's data changes"
+                }
+            }
+        }
+    }
+});
+
 // Create indexes for performance
 db.chat_logs.createIndex({"user_id": 1, "timestamp": -1});
 db.chat_logs.createIndex({"timestamp": -1});
@@ -117,6 +146,13 @@ db.system_logs.createIndex({"action": 1, "timestamp": -1});
 db.conversion_logs.createIndex({"user_id": 1, "timestamp": -1});
 db.conversion_logs.createIndex({"status": 1});
 db.vector_metadata.createIndex({"index": 1}, {unique: true});
+db.vector_metadata.createIndex({"doc_id": 1}, {unique: true, sparse: true});
+db.vector_metadata.createIndex({"metadata.type": 1});
+db.vector_metadata.createIndex({"metadata.category": 1});
+db.vector_metadata.createIndex({"metadata.region": 1});
+db.vector_metadata.createIndex({"metadata.float_id": 1});
+db.vector_metadata.createIndex({"metadata.topic": 1});
+db.vector_metadata.createIndex({"metadata.parameter": 1});
 
 // Insert sample data
 db.chat_logs.insertMany([
@@ -187,24 +223,28 @@ db.conversion_logs.insertMany([
 db.vector_metadata.insertMany([
     {
         index: 0,
+        doc_id: "sample:introduction",
         text: "ARGO floats are autonomous profiling floats that collect temperature and salinity data",
         metadata: {category: "introduction", importance: "high"},
         created_at: new Date()
     },
     {
         index: 1,
+        doc_id: "sample:temperature",
         text: "Temperature profiles show thermal stratification with warm surface and cold deep waters",
         metadata: {category: "oceanography", parameter: "temperature"},
         created_at: new Date()
     },
     {
         index: 2,
+        doc_id: "sample:salinity",
         text: "Salinity profiles indicate salt content measured in Practical Salinity Units PSU",
         metadata: {category: "oceanography", parameter: "salinity"},
         created_at: new Date()
     },
     {
         index: 3,
+        doc_id: "sample:indian_ocean",
         text: "Indian Ocean ARGO network monitors monsoon effects and thermohaline circulation",
         metadata: {category: "regional", region: "indian_ocean"},
         created_at: new Date()
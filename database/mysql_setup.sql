@@ -71,6 +71,21 @@ CREATE TABLE IF NOT EXISTS ocean_profiles (
     FOREIGN KEY (float_id) REFERENCES argo_floats(float_id) ON DELETE CASCADE
 );
 
+-- Profiles stored whole: one row per profile, its PRES/TEMP/PSAL/DOXY levels and QC
+-- flags packed into one compressed npz blob (see backend/profile_store.py)
+CREATE TABLE IF NOT EXISTS argo_profiles (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    float_id VARCHAR(20) NOT NULL,
+    profile_date DATETIME NOT NULL,
+    latitude DECIMAL(10, 6),
+    longitude DECIMAL(10, 6),
+    n_levels INT NOT NULL DEFAULT 0,
+    data MEDIUMBLOB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_float_profile (float_id, profile_date),
+    FOREIGN KEY (float_id) REFERENCES argo_floats(float_id) ON DELETE CASCADE
+);
+
 -- Insert sample data
 INSERT IGNORE INTO users (username, email, password_hash, role, full_name) VALUES
 ('admin', 'admin@floatchat.com', 'pbkdf2:sha256:260000$QjGVEcXIYQDVGktn$e8b7a7b6d5c9b3a2f1e4d7c0f3b6e9d2c5b8e1f4a7d0c3b6e9d2f5a8b1e4c7f0', 'admin', 'System Administrator'),